@@ -0,0 +1,229 @@
+"""Headless benchmark of every ordering x filtering combination.
+
+Runs the engine on a range of board sizes and seeded initial placements and
+reports, per run, wall time, search nodes (queen placements) per second,
+placements, backtracks and the peak memory allocated by the search:
+
+    python n_queens_benchmark.py --sizes 8 16 24 --seeds 3 --queens 2 -o bench.csv
+
+Results go to stdout as CSV unless `--output` names a .csv or .json file (or
+`--format` says otherwise). Times come from a plain run; peak memory from a
+second, identical run under tracemalloc so tracing doesn't skew the timings.
+
+`--max-nodes` and `--timeout` bound each run, so a configuration that
+thrashes on some size is reported as stopped ("node limit" / "timeout" in the
+status column) instead of stalling the sweep. Bounded runs step the solver
+through `steps()` to check the budget, which is slower than the plain run.
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from n_queens_engine import ALGORITHMS, FILTERINGS, ORDERINGS, SOLUTION, create_solver
+
+FIELDS = [
+    "algorithm",
+    "ordering",
+    "filtering",
+    "n",
+    "seed",
+    "initial_queens",
+    "solved",
+    "status",
+    "seconds",
+    "nodes_per_second",
+    "steps",
+    "placements",
+    "backtracks",
+    "peak_memory_kib",
+]
+
+
+def seeded_positions(n, seed, queens):
+    # `queens` distinct random squares, as a user might click them; they may
+    # attack each other, which the solvers resolve first
+    rng = random.Random(seed)
+    squares = rng.sample(range(n * n), min(queens, n * n))
+    return [divmod(square, n) for square in squares]
+
+
+def configurations(algorithms):
+    # (algorithm, ordering, filtering) to run; ordering and filtering only
+    # apply to backtracking
+    for algorithm in algorithms:
+        if algorithm == "Backtracking":
+            for ordering in ORDERINGS:
+                for filtering in FILTERINGS:
+                    yield algorithm, ordering, filtering
+        else:
+            yield algorithm, "None", "None"
+
+
+def run_benchmark(
+    sizes,
+    seeds=1,
+    queens=0,
+    algorithms=("Backtracking",),
+    memory=True,
+    max_nodes=None,
+    timeout=None,
+):
+    """Yield one result row (a dict keyed by FIELDS) per run."""
+    for n in sizes:
+        # With no initial queens every seed would be the same empty board
+        for seed in range(seeds if queens else 1):
+            positions = seeded_positions(n, seed, queens)
+            for algorithm, ordering, filtering in configurations(algorithms):
+                yield run_once(
+                    n,
+                    seed,
+                    positions,
+                    algorithm,
+                    ordering,
+                    filtering,
+                    memory,
+                    max_nodes,
+                    timeout,
+                )
+
+
+def run_once(
+    n,
+    seed,
+    positions,
+    algorithm,
+    ordering,
+    filtering,
+    memory=True,
+    max_nodes=None,
+    timeout=None,
+):
+    # Randomized solvers (local search, random tie-breaks) are seeded too, so
+    # the memory run repeats the timed one
+    solver = create_solver(n, positions, algorithm, ordering, filtering, seed=seed)
+    start = time.perf_counter()
+    deadline = start + timeout if timeout is not None else None
+    status = drive(solver, max_nodes, deadline)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        # Stopped runs are repeated up to the node they reached, not timed
+        # again, as tracing slows the solver down
+        if status in ("node limit", "timeout"):
+            max_nodes = solver.queen_placement
+        tracemalloc.start()
+        try:
+            drive(
+                create_solver(n, positions, algorithm, ordering, filtering, seed=seed),
+                max_nodes,
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "ordering": ordering,
+        "filtering": filtering,
+        "n": n,
+        "seed": seed,
+        "initial_queens": len(positions),
+        "solved": status == "solved",
+        "status": status,
+        "seconds": round(seconds, 6),
+        "nodes_per_second": round(solver.queen_placement / seconds) if seconds else None,
+        "steps": solver.step_number,
+        "placements": solver.queen_placement,
+        "backtracks": solver.backtracking,
+        "peak_memory_kib": round(peak / 1024, 1) if peak is not None else None,
+    }
+
+
+def drive(solver, max_nodes=None, deadline=None):
+    # Run `solver` to the end, or until it has placed more than `max_nodes`
+    # queens or the clock passes `deadline`, and return how it ended
+    if max_nodes is None and deadline is None:
+        return "solved" if solver.run() else "unsolved"
+    for count, event in enumerate(solver.steps()):
+        if event.kind == SOLUTION:
+            return "solved"
+        if max_nodes is not None and solver.queen_placement > max_nodes:
+            return "node limit"
+        # Reading the clock costs about as much as a step, so not every step
+        if deadline is not None and not count % 256 and time.perf_counter() > deadline:
+            return "timeout"
+    return "unsolved"
+
+
+def write_results(rows, out, fmt):
+    if fmt == "json":
+        json.dump(list(rows), out, indent=2)
+        out.write("\n")
+    else:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[8, 12, 16], help="board sizes N"
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=1, help="seeded initial placements per size"
+    )
+    parser.add_argument(
+        "--queens", type=int, default=0, help="queens in each seeded initial placement"
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=ALGORITHMS,
+        default=["Backtracking"],
+        help="algorithms to run; ordering x filtering apply to Backtracking",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        help="stop a run once it has placed more than this many queens",
+    )
+    parser.add_argument(
+        "--timeout", type=float, help="stop a run after this many seconds"
+    )
+    parser.add_argument("-o", "--output", help="write to this .csv or .json file")
+    parser.add_argument("--format", choices=["csv", "json"], help="output format")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the tracemalloc peak memory run"
+    )
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "json" if args.output and args.output.endswith(".json") else "csv"
+    rows = run_benchmark(
+        args.sizes,
+        args.seeds,
+        args.queens,
+        args.algorithms,
+        not args.no_memory,
+        args.max_nodes,
+        args.timeout,
+    )
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            write_results(rows, out, fmt)
+    else:
+        write_results(rows, sys.stdout, fmt)
+
+
+if __name__ == "__main__":
+    main()
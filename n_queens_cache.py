@@ -0,0 +1,155 @@
+"""Solution cache keyed by board symmetry, for answering repeat solves at once.
+
+Results are stored under N, the solver settings and the canonical form of the
+initial queens: the smallest sorted image of them under the 8 symmetries of
+the board. A request for any rotation or reflection of a cached placement
+hits the same entry, and the cached solution is mapped back through the
+inverse symmetry (the image of a solution is a solution, and user queens kept
+by the solver map onto user queens).
+
+    >>> from n_queens_engine import is_board_safe
+    >>> cache = Solution_Cache()
+    >>> first = cache.solve(8, [(0, 0)])
+    >>> mirrored = cache.solve(8, [(0, 7)])
+    >>> cache.hits, (0, 7) in mirrored.positions, is_board_safe(mirrored.positions)
+    (1, True, True)
+
+The solver `seed` is part of the key as well, so randomized solves are cached
+per seed. Entries beyond `maxsize` are evicted least recently used first. With `path`
+the cache is also kept in a `shelve` store on disk, read through on a miss, so
+results survive between sessions.
+"""
+
+import shelve
+from collections import OrderedDict
+
+from n_queens_engine import (
+    SYMMETRY_INVERSES,
+    SolveResult,
+    board_symmetries,
+    solve,
+)
+
+
+def canonical_form(n, positions):
+    # (canonical queens, index of the symmetry that maps `positions` onto them)
+    return min(
+        (tuple(sorted(transform(r, c) for r, c in positions)), i)
+        for i, transform in enumerate(board_symmetries(n))
+    )
+
+
+def transform_result(n, result, symmetry):
+    # `result` with its queens moved by board symmetry `symmetry`
+    transform = board_symmetries(n)[symmetry]
+    positions = sorted(transform(r, c) for r, c in result.positions)
+    return result._replace(positions=positions)
+
+
+class Solution_Cache:
+    """
+    Bounded LRU cache of `SolveResult`s in canonical orientation.
+
+    `get` and `put` take the caller's own placement and map results to and
+    from the canonical one; `solve` wraps the engine's `solve` with both.
+    """
+
+    def __init__(self, maxsize=128, path=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.store = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, n, initial_positions, algorithm, ordering, filtering, seed):
+        # (cache key, symmetry taking `initial_positions` to canonical form)
+        canonical, symmetry = canonical_form(n, set(initial_positions))
+        # A string, so the same key works for the shelve store
+        return repr((n, algorithm, ordering, filtering, seed, canonical)), symmetry
+
+    def get(
+        self,
+        n,
+        initial_positions=(),
+        algorithm="Backtracking",
+        ordering="MRV + LCV",
+        filtering="Arc Consistency",
+        seed=None,
+    ):
+        """The cached result for this solve, oriented like `initial_positions`, or None."""
+        key, symmetry = self.key(
+            n, initial_positions, algorithm, ordering, filtering, seed
+        )
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        elif self.store is not None and key in self.store:
+            result = SolveResult(*self.store[key])
+            self.remember(key, result)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return transform_result(n, result, SYMMETRY_INVERSES[symmetry])
+
+    def put(
+        self,
+        n,
+        initial_positions,
+        result,
+        algorithm="Backtracking",
+        ordering="MRV + LCV",
+        filtering="Arc Consistency",
+        seed=None,
+    ):
+        """Cache `result`, a solve of `initial_positions` with these settings."""
+        key, symmetry = self.key(
+            n, initial_positions, algorithm, ordering, filtering, seed
+        )
+        result = transform_result(n, SolveResult(*result), symmetry)
+        self.remember(key, result)
+        if self.store is not None:
+            self.store[key] = tuple(result)
+
+    def remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def solve(
+        self,
+        n,
+        initial_positions=(),
+        ordering="MRV + LCV",
+        filtering="Arc Consistency",
+        algorithm="Backtracking",
+        seed=None,
+    ):
+        """The engine's `solve`, answered from the cache when possible."""
+        initial_positions = set(initial_positions)
+        settings = (algorithm, ordering, filtering, seed)
+        result = self.get(n, initial_positions, *settings)
+        if result is None:
+            result = solve(n, initial_positions, ordering, filtering, algorithm, seed)
+            self.put(n, initial_positions, result, *settings)
+        return result
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
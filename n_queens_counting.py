@@ -0,0 +1,265 @@
+"""Exhaustive counting and enumeration of N-Queens solutions.
+
+Unlike the CSP engine, which stops at the first solution it can reach from
+the user's board, these functions walk the whole search tree with plain
+bitmask DFS (vectorized with NumPy for boards up to 64 columns), optionally
+splitting it across a process pool.
+
+    >>> count_solutions(12) == KNOWN_SOLUTION_COUNTS[12]
+    True
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from n_queens_engine import Conflict_Index
+from n_queens_strategies import iter_bits
+
+# Number of solutions of the empty N x N board, indexed by N (OEIS A000170)
+KNOWN_SOLUTION_COUNTS = (
+    1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200, 73712, 365596,
+    2279184, 14772512, 95815104, 666090624, 4968057848, 39029188884,
+    314666222712, 2691008701644, 24233937684440, 227514171973736,
+    2207893435808352, 22317699616364044, 234907967154122528,
+)
+
+
+def count_solutions(n, initial_positions=(), workers=1):
+    """
+    Count every solution of the N x N board that keeps the queens in
+    `initial_positions`.
+
+    Rows are filled top to bottom with bitmask DFS. When the pre-placed queens
+    are mirror symmetric (always true for an empty board), each solution's
+    mirror image is also a solution, so only branches whose first off-centre
+    queen is on the left half are searched and counted twice.
+
+    With `workers` > 1 (None for one per CPU) the search is split into the
+    subtrees of its first two branching rows, which a process pool counts in
+    parallel. Scripts doing so need the usual `if __name__ == "__main__":`
+    guard on platforms that spawn worker processes.
+
+        >>> count_solutions(8)
+        92
+        >>> count_solutions(8, [(0, 0)])
+        4
+    """
+    row_masks = _row_masks(n, initial_positions)
+    if row_masks is None:
+        return 0
+    subtrees = _search_subtrees(row_masks, initial_positions)
+    return sum(_map_subtrees(_count_subtree, row_masks, subtrees, workers))
+
+
+def find_first_solution(n, initial_positions=(), workers=1):
+    """
+    The first solution in row-by-row column order that keeps the queens in
+    `initial_positions`, as a list of (row, col), or None if there is none.
+
+    Searches the same subtrees as `count_solutions`. With `workers` > 1 they
+    are searched in parallel; once every subtree before the first successful
+    one is exhausted the queued ones are cancelled and the running ones are
+    left to finish.
+
+        >>> find_first_solution(6)
+        [(0, 1), (1, 3), (2, 5), (3, 0), (4, 2), (5, 4)]
+    """
+    row_masks = _row_masks(n, initial_positions)
+    if row_masks is None:
+        return None
+    subtrees = _search_subtrees(row_masks, initial_positions)
+    for cols in _map_subtrees(_first_completion, row_masks, subtrees, workers):
+        if cols is not None:
+            return list(enumerate(cols))
+    return None
+
+
+# A subtree of the counting search: the queens in rows < `row` are placed in
+# columns `prefix`, `avail` are the columns still free in `row`, and each of
+# its solutions stands for `weight` solutions of the whole board
+_Subtree = namedtuple("_Subtree", ["weight", "row", "avail", "cols", "ld", "rd", "prefix"])
+
+
+def _row_masks(n, positions):
+    # Columns allowed in each row, or None if the pre-placed queens conflict
+    positions = set(positions)
+    if any(not (0 <= r < n and 0 <= c < n) for r, c in positions):
+        raise ValueError(f"Queen outside the {n}x{n} board")
+    if Conflict_Index(positions).conflicts:
+        return None
+    row_masks = [(1 << n) - 1] * n
+    for row, col in positions:
+        row_masks[row] = 1 << col
+    return row_masks
+
+
+def _search_subtrees(row_masks, positions):
+    # The disjoint subtrees whose weighted solutions add up to the board's
+    n = len(row_masks)
+    full = (1 << n) - 1
+    positions = set(positions)
+    if n <= 1:
+        return [_Subtree(1, n, 0, 0, 0, 0, (0,) * n)]
+    if {(r, n - 1 - c) for r, c in positions} != positions:
+        return [_Subtree(1, 0, row_masks[0], 0, 0, 0, ())]
+
+    left = (1 << n // 2) - 1
+    middle = 1 << n // 2 if n % 2 else 0
+    subtrees = []
+    cols = ld = rd = 0
+    for row in range(n):
+        # While every queen so far is in the middle column the board is its
+        # own mirror image; the first queen off it breaks the symmetry. Two
+        # queens can't share the middle column, so this stops by row 1.
+        avail = row_masks[row] & ~(cols | ld | rd)
+        subtrees.append(_Subtree(2, row, avail & left, cols, ld, rd, (n // 2,) * row))
+        bit = avail & middle
+        if not bit:
+            break
+        cols |= bit
+        ld = (ld | bit) << 1 & full
+        rd = (rd | bit) >> 1
+    return subtrees
+
+
+def _split_subtree(row_masks, tree):
+    # One child subtree per column still free in the subtree's top row
+    n = len(row_masks)
+    if tree.row >= n - 1:
+        return [tree]
+    full = (1 << n) - 1
+    children = []
+    for col in iter_bits(tree.avail):
+        bit = 1 << col
+        cols = tree.cols | bit
+        ld = (tree.ld | bit) << 1 & full
+        rd = (tree.rd | bit) >> 1
+        avail = row_masks[tree.row + 1] & ~(cols | ld | rd)
+        children.append(
+            _Subtree(tree.weight, tree.row + 1, avail, cols, ld, rd, tree.prefix + (col,))
+        )
+    return children
+
+
+def _map_subtrees(func, row_masks, subtrees, workers=1):
+    # Yield func(row_masks, subtree) for every subtree, in order. In parallel
+    # the subtrees are split two rows further into many small tasks that idle
+    # workers pull from the pool's shared queue one at a time, so a worker
+    # that lands on a small subtree takes over queued work instead of waiting
+    # on a big one. Closing the generator early cancels the unstarted tasks.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for tree in subtrees:
+            yield func(row_masks, tree)
+        return
+
+    for _ in range(2):
+        subtrees = [child for tree in subtrees for child in _split_subtree(row_masks, tree)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(func, row_masks, tree) for tree in subtrees]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _count_subtree(row_masks, tree):
+    if tree.row >= len(row_masks):
+        return tree.weight
+    full = (1 << len(row_masks)) - 1
+    return tree.weight * _count_completions(
+        row_masks, tree.row, tree.avail, tree.cols, tree.ld, tree.rd, full
+    )
+
+
+def _first_completion(row_masks, tree):
+    # Columns of the first solution in the subtree, depth first and left to
+    # right, or None
+    n = len(row_masks)
+    full = (1 << n) - 1
+    placed = list(tree.prefix)
+    # One frame per row from tree.row down: the columns left to try in that
+    # row and the attacks on it. `placed` holds a column for every row above
+    # the frame on top.
+    stack = [(tree.avail, tree.cols, tree.ld, tree.rd)]
+    while stack:
+        avail, cols, ld, rd = stack.pop()
+        del placed[tree.row + len(stack):]
+        if len(placed) == n:
+            return placed
+        if not avail:
+            continue
+        bit = avail & -avail
+        stack.append((avail ^ bit, cols, ld, rd))
+        placed.append(bit.bit_length() - 1)
+        cols |= bit
+        ld = (ld | bit) << 1 & full
+        rd = (rd | bit) >> 1
+        row = tree.row + len(stack)
+        stack.append((row_masks[row] & ~(cols | ld | rd) if row < n else 0, cols, ld, rd))
+    return None
+
+
+def _count_completions(row_masks, row, avail, cols, ld, rd, full):
+    # Solutions below `row`, given the columns `avail` still free in it.
+    # `ld` / `rd` are the diagonals attacked in `row`, shifted one column per
+    # row so the next row's attacks are a single shift away.
+    if len(row_masks) <= 64:
+        state = [np.array([x], dtype=np.uint64) for x in (avail, cols, ld, rd)]
+        return _count_batch(row_masks, row, *state)
+    if row == len(row_masks) - 1:
+        return avail.bit_count()
+    next_mask = row_masks[row + 1]
+    total = 0
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        next_cols = cols | bit
+        next_ld = (ld | bit) << 1 & full
+        next_rd = (rd | bit) >> 1
+        next_avail = next_mask & ~(next_cols | next_ld | next_rd)
+        if next_avail:
+            total += _count_completions(
+                row_masks, row + 1, next_avail, next_cols, next_ld, next_rd, full
+            )
+    return total
+
+
+COUNT_BATCH_SIZE = 1 << 15
+
+
+def _count_batch(row_masks, row, avail, cols, ld, rd):
+    # Vectorized `_count_completions` for boards up to 64 columns: the states
+    # of a whole row are uint64 arrays and every pass expands each state by
+    # its lowest free column, so a row costs one pass per column of its
+    # fullest state instead of one Python call per node
+    if row == len(row_masks) - 1:
+        return int(np.bitwise_count(avail).sum())
+    one = np.uint64(1)
+    full = np.uint64((1 << len(row_masks)) - 1)
+    next_mask = np.uint64(row_masks[row + 1])
+    total = 0
+    for start in range(0, len(avail), COUNT_BATCH_SIZE):
+        batch = slice(start, start + COUNT_BATCH_SIZE)
+        a, c, l, r = avail[batch], cols[batch], ld[batch], rd[batch]
+        children = []
+        while True:
+            live = a != 0
+            if not live.all():
+                a, c, l, r = a[live], c[live], l[live], r[live]
+                if not len(a):
+                    break
+            bit = a & (~a + one)
+            a = a ^ bit
+            children.append((c | bit, (l | bit) << one & full, (r | bit) >> one))
+        if children:
+            next_cols, next_ld, next_rd = (np.concatenate(x) for x in zip(*children))
+            next_avail = next_mask & ~(next_cols | next_ld | next_rd)
+            total += _count_batch(row_masks, row + 1, next_avail, next_cols, next_ld, next_rd)
+    return total
@@ -0,0 +1,1038 @@
+"""Headless N-Queens CSP solver engine.
+
+This module has no matplotlib / ipywidgets / IPython dependency so it can be
+imported and run in a plain Python process (batch workers, scripts, tests).
+The playground UI drives the same engine and animates it step by step.
+
+    >>> from n_queens_engine import solve
+    >>> result = solve(8, ordering="MRV", filtering="Forward Checking")
+    >>> result.solved
+    True
+"""
+
+import os
+import random
+from collections import defaultdict, namedtuple
+
+
+from n_queens_strategies import (
+    FILTERING_STRATEGIES,
+    ORDERING_STRATEGIES,
+    VALUE_ORDERINGS,
+    VARIABLE_ORDERINGS,
+    iter_bits,
+)
+
+ORDERINGS = list(ORDERING_STRATEGIES)
+FILTERINGS = list(FILTERING_STRATEGIES)
+
+SolveResult = namedtuple(
+    "SolveResult", ["solved", "positions", "steps", "placements", "backtracks"]
+)
+
+# What `steps()` yields: a queen placed or removed at (row, col), column `col`
+# pruned from the domain of `row`, or the board solved (row and col are None)
+SolverEvent = namedtuple("SolverEvent", ["kind", "row", "col"])
+PLACE = "place"
+REMOVE = "remove"
+PRUNE = "prune"
+SOLUTION = "solution"
+
+
+### Conflict Helper Functions ###
+class Conflict_Index:
+    """
+    Occupancy counters per row, column, diagonal and anti-diagonal of a set of
+    queens. Two queens conflict iff they share one of these lines, so a line
+    holding k queens contributes k * (k - 1) conflicts (ordered pairs) and
+    adding or removing a queen updates the total in O(1).
+    """
+
+    def __init__(self, positions=()):
+        self.rows = defaultdict(int)
+        self.cols = defaultdict(int)
+        self.diags = defaultdict(int)
+        self.anti_diags = defaultdict(int)
+        self.conflicts = 0
+        for row, col in positions:
+            self.add(row, col)
+
+    def add(self, row, col):
+        self.conflicts += 2 * self.queen_lines(row, col)
+        self.rows[row] += 1
+        self.cols[col] += 1
+        self.diags[col - row] += 1
+        self.anti_diags[row + col] += 1
+
+    def remove(self, row, col):
+        self.rows[row] -= 1
+        self.cols[col] -= 1
+        self.diags[col - row] -= 1
+        self.anti_diags[row + col] -= 1
+        self.conflicts -= 2 * self.queen_lines(row, col)
+
+    def queen_lines(self, row, col):
+        # Queens (other than one at (row, col) itself) sharing a line with (row, col)
+        return (
+            self.rows[row]
+            + self.cols[col]
+            + self.diags[col - row]
+            + self.anti_diags[row + col]
+        )
+
+    def queen_conflicts(self, row, col):
+        # Conflicts of a queen that is on the board
+        return self.queen_lines(row, col) - 4
+
+    def find_most_conflict(self, positions):
+        # Ties go to the lowest (row, col) so the result doesn't depend on set order
+        return max(
+            positions,
+            key=lambda q: (self.queen_conflicts(*q), -q[0], -q[1]),
+            default=(-1, -1),
+        )
+
+
+def is_board_safe(positions):
+    """
+    Check if the entire board is safe (no queens threaten each other).
+    """
+    return Conflict_Index(positions).conflicts == 0
+
+
+def find_most_conflict(positions):
+    return Conflict_Index(positions).find_most_conflict(positions)
+
+
+def count_conflicts(positions):
+    return Conflict_Index(positions).conflicts
+
+
+class N_Queens_Solver:
+    """
+    Backtracking CSP solver for one N-Queens instance.
+
+    `steps()` is a generator that performs the search and yields a
+    `SolverEvent` for every queen placement and removal and every pruned
+    value, then one `SOLUTION` event if the board is solved. The search only
+    advances as the caller pulls events, so a caller can observe (or
+    animate, or record) it at its own pace and stop it at any point simply
+    by no longer iterating. `run()` drives the search to completion.
+    `seed` seeds the random tie-breaks of the "MRV + Random" orderings.
+    """
+
+    def __init__(
+        self,
+        n,
+        positions=(),
+        algorithm="Backtracking",
+        ordering="MRV + LCV",
+        filtering="Arc Consistency",
+        seed=None,
+    ):
+        if ordering not in ORDERINGS or filtering not in FILTERINGS:
+            raise ValueError(f"Unknown configuration: {ordering} / {filtering}")
+
+        self.n = n
+        self.positions = set(positions)
+        self.algorithm = algorithm
+        self.ordering = ordering
+        self.filtering = filtering
+        self.random = random.Random(seed)
+
+        variable_ordering, value_ordering = ORDERING_STRATEGIES[ordering]
+        self.variable_ordering = VARIABLE_ORDERINGS[variable_ordering]()
+        self.value_ordering = VALUE_ORDERINGS[value_ordering]()
+        self.filter = FILTERING_STRATEGIES[filtering]()
+
+        # Per-line safe spot counters are only maintained if a strategy reads them
+        self.track_safe_counts = any(
+            getattr(strategy, "uses_safe_counts", False)
+            for strategy in (self.variable_ordering, self.value_ordering, self.filter)
+        )
+
+        self.step_number = 0
+        self.queen_placement = 0
+        self.backtracking = 0
+
+        self.conflict_index = Conflict_Index(self.positions)
+        # (row, cols) prunings not yet reported by steps(); None when not streaming
+        self.pruned = None
+
+    def run(self, check=True):
+        """
+        Solve to completion with the synchronous core: no generator frames and
+        no per-step hooks, only the counters are kept up to date.
+
+        With `check=False` the finished board is not verified and the result
+        only says whether it was filled, for callers that verify boards
+        themselves (`solve_batch`).
+        """
+        while self.remove_conflicting_queen():
+            pass
+        self.update_threats_matrix()
+
+        while not self.solve_n_queens_fast():
+            if not self.positions:
+                return False  # Not even the empty board can be completed
+            self.remove_blocking_queen()
+        return self.is_solved() if check else len(self.positions) == self.n
+
+    def is_solved(self):
+        return len(self.positions) == self.n and is_board_safe(self.positions)
+
+    def result(self):
+        return SolveResult(
+            self.is_solved(),
+            sorted(self.positions),
+            self.step_number,
+            self.queen_placement,
+            self.backtracking,
+        )
+
+    def steps(self):
+        self.pruned = []
+
+        while queen := self.remove_conflicting_queen():
+            yield SolverEvent(REMOVE, *queen)
+
+        # The remaining queens are conflict free, so each row/column/diagonal
+        # holds at most one queen and can be tracked as a single bit
+        self.update_threats_matrix()
+
+        solver = yield from self.solve_n_queens_util()
+
+        while not solver:
+            if not self.positions:
+                return  # Not even the empty board can be completed
+            queen = self.remove_blocking_queen()
+            yield SolverEvent(REMOVE, *queen)
+
+            solver = yield from self.solve_n_queens_util()
+
+        yield SolverEvent(SOLUTION, None, None)
+
+    def remove_conflicting_queen(self):
+        if self.conflict_index.conflicts == 0:
+            return None
+
+        row, col = self.conflict_index.find_most_conflict(self.positions)
+        # Backtracking
+        self.conflict_index.remove(row, col)
+        self.positions.remove((row, col))  # Remove Queen position
+        self.step_number += 1  # Update total step counter
+        self.backtracking += 1  # Update backtracking step counter
+        return row, col
+
+    def remove_blocking_queen(self):
+        # Remove the queen that opens up most safe spots
+        row, col = self.find_queen_to_remove()
+        self.remove_queen(row, col)
+        return row, col
+
+    ### Backtracking search shared by every ordering/filtering combination
+    # The search keeps its own stack instead of recursing, so board size isn't
+    # bounded by Python's recursion limit and no frame is set up per node. A
+    # stack entry is a node that has a queen placed: (row, col, columns left
+    # to try in that row, trail mark to restore when the node fails).
+    def solve_n_queens_util(self, row=0):
+        stack = []
+        while True:
+            # Enter a node: Base Case, all rows are occupied
+            if self.rows == self.full:
+                return True
+
+            # Values pruned from here on are restored when this node fails
+            mark = len(self.trail)
+            cols = ()
+            consistent = self.filter.consistent(self)
+            yield from self.prune_events()
+            if consistent:
+                row = self.variable_ordering.select(self, row)
+                domain = self.filter.domain(self, row)
+                yield from self.prune_events()
+                cols = self.value_ordering.order(self, row, domain)
+            cols = iter(cols)
+
+            # Place the next value of the deepest node that has one left,
+            # backtracking out of exhausted nodes
+            while (col := next(cols, None)) is None:
+                self.undo_pruning(mark)
+                if not stack:
+                    return False
+                row, col, cols, mark = stack.pop()
+                self.remove_queen(row, col)
+                yield SolverEvent(REMOVE, row, col)
+
+            self.place_queen(row, col)
+            yield SolverEvent(PLACE, row, col)
+            stack.append((row, col, cols, mark))
+            row += 1
+
+    # Same search without events, used by run()
+    def solve_n_queens_fast(self, row=0):
+        stack = []
+        while True:
+            if self.rows == self.full:
+                return True
+
+            mark = len(self.trail)
+            cols = ()
+            if self.filter.consistent(self):
+                row = self.variable_ordering.select(self, row)
+                domain = self.filter.domain(self, row)
+                cols = self.value_ordering.order(self, row, domain)
+            cols = iter(cols)
+
+            while (col := next(cols, None)) is None:
+                self.undo_pruning(mark)
+                if not stack:
+                    return False
+                row, col, cols, mark = stack.pop()
+                self.remove_queen(row, col)
+
+            self.place_queen(row, col)
+            stack.append((row, col, cols, mark))
+            row += 1
+
+    def place_queen(self, row, col):
+        self.update_threats(row, col)  # Place the queen and update threats
+        self.positions.add((row, col))  # Add Queen position
+        self.step_number += 1  # Update total step counter
+        self.queen_placement += 1  # Update Queen placement counter
+
+    def remove_queen(self, row, col):
+        self.backtrack_threats(row, col)  # Remove the queen and backtrack threats
+        self.positions.remove((row, col))  # Remove Queen position
+        self.step_number += 1  # Update total step counter
+        self.backtracking += 1  # Update backtracking step counter
+
+    ### Solver Helper Functions ###
+    # The board is stored as bitmasks: bit r of `rows` and bit c of `cols` mark
+    # an occupied row/column, bit (c - r + n - 1) of `diags` and bit (r + c) of
+    # `anti_diags` mark an occupied diagonal/anti-diagonal. A square has zero
+    # threats iff none of its four lines is occupied, so placement, removal
+    # and safety checks are a handful of integer operations.
+    def update_threats_matrix(self):
+        self.full = (1 << self.n) - 1
+        self.rows = 0
+        self.cols = 0
+        self.diags = 0
+        self.anti_diags = 0
+
+        # Columns not yet pruned by filtering, per row. Every pruning pushes the
+        # row's previous domain on the trail so a failed node can restore it.
+        self.domains = [self.full] * self.n
+        self.trail = []
+
+        if self.track_safe_counts:
+            # Safe spots (squares not attacked along a column or diagonal) per
+            # column, diagonal and anti-diagonal of the empty board, and per
+            # row the safe spots not pruned either: for an unused row, the
+            # size of its domain. Unused rows are also bucketed by that count,
+            # `free_rows[k]` holding those with k free squares, so forward
+            # checking is an emptiness test and MRV reads the lowest nonempty
+            # bucket; no bucket below `min_free` holds a row. Buckets are
+            # bitmasks over the variable ordering's preferred row order (bit i
+            # for row `bucket_rows[i]`), so a tie-breaker takes the lowest bit.
+            n = self.n
+            row_order = getattr(self.variable_ordering, "row_order", None)
+            self.bucket_rows = row_order(n) if row_order else list(range(n))
+            self.row_bits = [0] * n
+            for i, row in enumerate(self.bucket_rows):
+                self.row_bits[row] = 1 << i
+            self.row_free = [n] * n
+            self.free_rows = [0] * (n + 1)
+            self.free_rows[n] = (1 << n) - 1
+            self.min_free = n
+            # The masks again as byte flags: the per-square loop in
+            # update_safe_counts indexes these instead of shifting big ints
+            self.col_used = bytearray(n)
+            self.diag_used = bytearray(2 * n - 1)
+            self.anti_used = bytearray(2 * n - 1)
+            # Rows whose domain has been pruned, the only ones where a safe
+            # square may not be free
+            self.pruned_rows = set()
+            self.col_safe = [n] * n
+            self.diag_safe = [n - abs(k - n + 1) for k in range(2 * n - 1)]
+            self.anti_safe = self.diag_safe[:]
+            self.safe_spots = n * n
+
+        for r, c in self.positions:
+            self.update_threats(r, c)
+
+    def update_threats(self, row, col):
+        if self.track_safe_counts:
+            self.update_safe_counts(row, col, -1)
+            # The row is no longer unused
+            self.free_rows[self.row_free[row]] &= ~self.row_bits[row]
+            self.col_used[col] = 1
+            self.diag_used[col - row + self.n - 1] = 1
+            self.anti_used[row + col] = 1
+        self.rows |= 1 << row
+        self.cols |= 1 << col
+        self.diags |= 1 << (col - row + self.n - 1)
+        self.anti_diags |= 1 << (row + col)
+
+    def backtrack_threats(self, row, col):
+        self.rows &= ~(1 << row)
+        self.cols &= ~(1 << col)
+        self.diags &= ~(1 << (col - row + self.n - 1))
+        self.anti_diags &= ~(1 << (row + col))
+        if self.track_safe_counts:
+            self.col_used[col] = 0
+            self.diag_used[col - row + self.n - 1] = 0
+            self.anti_used[row + col] = 0
+            self.free_rows[self.row_free[row]] |= self.row_bits[row]
+            self.min_free = min(self.min_free, self.row_free[row])
+            self.update_safe_counts(row, col, 1)
+
+    def update_safe_counts(self, row, col, delta):
+        # The squares a queen at (row, col) attacks that no other queen does:
+        # at most three per row, on its column and its two diagonals. Called
+        # with the queen absent from the masks (before placing, after removing).
+        n = self.n
+        rows, pruned_rows = self.rows, self.pruned_rows
+        cols, diags, anti_diags = self.col_used, self.diag_used, self.anti_used
+        domains, row_free, col_safe = self.domains, self.row_free, self.col_safe
+        diag_safe, anti_safe = self.diag_safe, self.anti_safe
+        free_rows, min_free, row_bits = self.free_rows, self.min_free, self.row_bits
+        changed = 0
+        for r in range(n):
+            d = r - row
+            domain = domains[r] if r in pruned_rows else None
+            free = 0
+            for c in (col, col + d, col - d) if d else (col,):
+                if (
+                    0 <= c < n
+                    and not cols[c]
+                    and not diags[c - r + n - 1]
+                    and not anti_diags[r + c]
+                ):
+                    if domain is None or domain >> c & 1:
+                        free += 1
+                    col_safe[c] += delta
+                    diag_safe[c - r + n - 1] += delta
+                    anti_safe[r + c] += delta
+                    changed += delta
+            if free:
+                old = row_free[r]
+                row_free[r] = new = old + delta * free
+                if not rows >> r & 1:
+                    # An unused row is always in the bucket of its count
+                    free_rows[old] ^= row_bits[r]
+                    free_rows[new] |= row_bits[r]
+                    if new < min_free:
+                        min_free = new
+        self.safe_spots += changed
+        self.min_free = min_free
+
+    def prune_values(self, row, cols):
+        if self.pruned is not None:
+            self.pruned.append((row, cols & self.domains[row]))
+        self.trail.append((row, self.domains[row]))
+        if self.track_safe_counts:
+            self.update_free_count(row, -(self.safe_cols(row) & cols).bit_count())
+            self.pruned_rows.add(row)
+        self.domains[row] &= ~cols
+
+    def prune_events(self):
+        # Report the values pruned since the last call
+        pruned, self.pruned = self.pruned, []
+        for row, cols in pruned:
+            for col in iter_bits(cols):
+                yield SolverEvent(PRUNE, row, col)
+
+    def undo_pruning(self, mark):
+        trail = self.trail
+        domains = self.domains
+        while len(trail) > mark:
+            row, domain = trail.pop()
+            if self.track_safe_counts:
+                restored = domain & ~domains[row]
+                domains[row] = domain
+                self.update_free_count(row, (self.safe_cols(row) & restored).bit_count())
+                if domain == self.full:
+                    self.pruned_rows.discard(row)
+            else:
+                domains[row] = domain
+
+    def update_free_count(self, row, delta):
+        # Free squares of `row` gained (or lost, if negative) through pruning
+        if not delta:
+            return
+        old = self.row_free[row]
+        self.row_free[row] = new = old + delta
+        if not self.rows >> row & 1:
+            bit = self.row_bits[row]
+            self.free_rows[old] &= ~bit
+            self.free_rows[new] |= bit
+            self.min_free = min(self.min_free, new)
+
+    def fewest_free_rows(self):
+        # The bucket of the unused rows with the fewest free squares (needs the
+        # safe counts)
+        free_rows, k = self.free_rows, self.min_free
+        while not free_rows[k]:
+            k += 1
+        self.min_free = k
+        return free_rows[k]
+
+    def attacked_cols(self, row, cols, diags, anti_diags):
+        # Columns of `row` attacked along a column or diagonal
+        return (cols | diags >> (self.n - 1 - row) | anti_diags >> row) & self.full
+
+    def safe_cols(self, row):
+        # Bitmask of the unpruned columns of `row` not attacked by any queen
+        attacked = self.attacked_cols(row, self.cols, self.diags, self.anti_diags)
+        return self.domains[row] & ~attacked
+
+    def free_cols(self, row):
+        # Bitmask of zero-threat, unpruned columns in `row`
+        if self.rows >> row & 1:
+            return 0
+        attacked = self.attacked_cols(row, self.cols, self.diags, self.anti_diags)
+        return self.domains[row] & ~attacked
+
+    def find_queen_to_remove(self):
+        max_safe = -1
+        row_r = -1
+        col_r = -1
+        # Sorted so ties go to the lowest (row, col), whatever the set order
+        for row, col in sorted(self.positions):
+            safe_spots = self.count_safe_spots_for_board_remove(row, col)
+            if safe_spots > max_safe:
+                max_safe = safe_spots
+                row_r = row
+                col_r = col
+        return row_r, col_r
+
+    def count_safe_spots(self, cols, diags, anti_diags):
+        # Squares in any row not attacked along a column or diagonal
+        safe_spots = 0
+        for r in range(self.n):
+            safe_spots += self.n - self.attacked_cols(r, cols, diags, anti_diags).bit_count()
+        return safe_spots
+
+    def count_safe_spots_for_board_remove(self, row, col):
+        return self.count_safe_spots(
+            self.cols & ~(1 << col),
+            self.diags & ~(1 << (col - row + self.n - 1)),
+            self.anti_diags & ~(1 << (row + col)),
+        )
+
+
+class Min_Conflicts_Solver:
+    """
+    Min-conflicts local search for one N-Queens instance.
+
+    Every row holds one queen and the columns form a permutation, so only
+    diagonal conflicts are possible. The initial assignment keeps the user's
+    queens (one per row and column) and fills the other rows greedily; then
+    conflicted queens are repaired by swapping the columns of two rows, which
+    keeps the permutation and is scored in O(1) from per-diagonal counters.
+    If no improving swap is found a random swap is made to leave the plateau,
+    and the search restarts from a fresh random assignment after `max_steps`
+    moves. Ordering and filtering do not apply and are ignored.
+
+    Offers the same `steps()` / `run()` / `result()` interface as
+    `N_Queens_Solver`.
+    """
+
+    # Random columns tried per row while building the initial assignment
+    INITIAL_TRIES = 50
+    # Random partners tried for a conflicted queen before a random swap
+    REPAIR_TRIES = 100
+
+    def __init__(
+        self,
+        n,
+        positions=(),
+        algorithm="Min-Conflicts",
+        ordering="None",
+        filtering="None",
+        seed=None,
+        max_steps=None,
+        max_restarts=100,
+    ):
+        self.n = n
+        self.positions = set(positions)
+        self.algorithm = algorithm
+        self.ordering = ordering
+        self.filtering = filtering
+        self.random = random.Random(seed)
+        self.max_steps = max_steps if max_steps is not None else 100 + 4 * n
+        self.max_restarts = max_restarts
+
+        self.step_number = 0
+        self.queen_placement = 0
+        self.backtracking = 0
+
+        self.queens = None
+
+    def steps(self):
+        yield from self.search(animate=True)
+        if self.is_solved():
+            yield SolverEvent(SOLUTION, None, None)
+
+    def run(self, check=True):
+        # Nothing yields when not animating, so this is a single plain call.
+        # The counters make is_solved() cheap, so it always runs
+        for _ in self.search(animate=False):
+            pass
+        return self.is_solved()
+
+    def is_solved(self):
+        return (
+            self.queens is not None
+            and max(self.diag_counts) <= 1
+            and max(self.anti_diag_counts) <= 1
+        )
+
+    def result(self):
+        return SolveResult(
+            self.is_solved(),
+            list(enumerate(self.queens)) if self.is_solved() else sorted(self.positions),
+            self.step_number,
+            self.queen_placement,
+            self.backtracking,
+        )
+
+    def search(self, animate):
+        for restart in range(self.max_restarts + 1):
+            conflicted = yield from self.initial_assignment(animate, restart == 0)
+            if (yield from self.repair(conflicted, animate)):
+                if not animate:
+                    self.positions.clear()
+                    self.positions.update(enumerate(self.queens))
+                return
+
+            # Stalled: take every queen off and start over
+            if animate:
+                for row, col in enumerate(self.queens):
+                    self.positions.discard((row, col))
+                    self.step_number += 1
+                    self.backtracking += 1
+                    yield SolverEvent(REMOVE, row, col)
+            else:
+                self.step_number += self.n
+                self.backtracking += self.n
+                self.positions.clear()
+
+    def initial_assignment(self, animate, keep_positions):
+        n = self.n
+        m = n - 1
+        rand = self.random.random
+        positions = self.positions
+        queens = self.queens = [-1] * n
+        d1 = self.diag_counts = [0] * (2 * n - 1)
+        d2 = self.anti_diag_counts = [0] * (2 * n - 1)
+        conflicted = []
+
+        used = bytearray(n)
+        if keep_positions:
+            for r, c in sorted(positions):
+                if queens[r] < 0 and not used[c]:
+                    queens[r] = c
+                    used[c] = 1
+                    if d1[r - c + m] or d2[r + c]:
+                        conflicted.append(r)
+                    d1[r - c + m] += 1
+                    d2[r + c] += 1
+                else:
+                    # A second queen in this row or column
+                    positions.discard((r, c))
+                    self.step_number += 1
+                    self.backtracking += 1
+                    if animate:
+                        yield SolverEvent(REMOVE, r, c)
+
+        rows = [r for r in range(n) if queens[r] < 0]
+        cols = [c for c in range(n) if not used[c]]
+
+        # Give each free row a random unused column, preferring one on free
+        # diagonals; cols[k:] are the columns still unused
+        left = len(cols)
+        tries = range(self.INITIAL_TRIES - 1)
+        for k, r in enumerate(rows):
+            j = k + int(rand() * left)
+            c = cols[j]
+            if d1[r - c + m] or d2[r + c]:
+                for _ in tries:
+                    j = k + int(rand() * left)
+                    c = cols[j]
+                    if not d1[r - c + m] and not d2[r + c]:
+                        break
+                else:
+                    # A queen placed on a busy diagonal is the only member of
+                    # the new conflicts, so the repair worklist stays complete
+                    conflicted.append(r)
+            cols[j] = cols[k]
+            cols[k] = c
+            left -= 1
+
+            queens[r] = c
+            d1[r - c + m] += 1
+            d2[r + c] += 1
+            if animate:
+                self.step_number += 1
+                self.queen_placement += 1
+                positions.add((r, c))
+                yield SolverEvent(PLACE, r, c)
+
+        if not animate:
+            self.step_number += len(rows)
+            self.queen_placement += len(rows)
+        return conflicted
+
+    def repair(self, conflicted, animate):
+        # Every conflicting pair of queens has at least one row in
+        # `conflicted`; a swap only creates conflicts involving the two
+        # swapped rows, which are re-queued when still conflicted.
+        n = self.n
+        m = n - 1
+        rand = self.random.random
+        queens = self.queens
+        d1 = self.diag_counts
+        d2 = self.anti_diag_counts
+        moves = 0
+
+        while conflicted:
+            i = conflicted.pop()
+            ci = queens[i]
+            if d1[i - ci + m] == 1 and d2[i + ci] == 1:
+                continue
+            if moves >= self.max_steps:
+                return False
+
+            for attempt in range(self.REPAIR_TRIES + 1):
+                # Any other row
+                j = int(rand() * (n - 1))
+                if j >= i:
+                    j += 1
+                cj = queens[j]
+                a1, a2, b1, b2 = i - ci + m, i + ci, j - cj + m, j + cj
+                e1, e2, f1, f2 = i - cj + m, i + cj, j - ci + m, j + ci
+
+                # Lift both queens, then compare the queens attacking their
+                # current squares with those attacking the swapped squares
+                d1[a1] -= 1
+                d2[a2] -= 1
+                d1[b1] -= 1
+                d2[b2] -= 1
+                before = d1[a1] + d2[a2] + d1[b1] + d2[b2]
+                after = d1[e1] + d2[e2] + d1[f1] + d2[f2]
+                if after < before or attempt == self.REPAIR_TRIES:
+                    break
+                d1[a1] += 1
+                d2[a2] += 1
+                d1[b1] += 1
+                d2[b2] += 1
+
+            d1[e1] += 1
+            d2[e2] += 1
+            d1[f1] += 1
+            d2[f2] += 1
+            queens[i] = cj
+            queens[j] = ci
+            moves += 1
+
+            if d1[e1] > 1 or d2[e2] > 1:
+                conflicted.append(i)
+            if d1[f1] > 1 or d2[f2] > 1:
+                conflicted.append(j)
+
+            # Two queens taken off and put back down
+            if animate:
+                for kind, row, col in (
+                    (REMOVE, i, ci),
+                    (REMOVE, j, cj),
+                    (PLACE, i, cj),
+                    (PLACE, j, ci),
+                ):
+                    if kind == REMOVE:
+                        self.positions.remove((row, col))
+                        self.backtracking += 1
+                    else:
+                        self.positions.add((row, col))
+                        self.queen_placement += 1
+                    self.step_number += 1
+                    yield SolverEvent(kind, row, col)
+            else:
+                self.step_number += 4
+                self.queen_placement += 2
+                self.backtracking += 2
+
+        return True
+
+
+def board_symmetries(n):
+    # The 8 symmetries of the N x N board as (row, col) -> (row, col) maps,
+    # identity first; SYMMETRY_INVERSES[i] is the index of the inverse of map i
+    m = n - 1
+    return (
+        lambda r, c: (r, c),
+        lambda r, c: (r, m - c),
+        lambda r, c: (m - r, c),
+        lambda r, c: (m - r, m - c),
+        lambda r, c: (c, r),
+        lambda r, c: (c, m - r),
+        lambda r, c: (m - c, r),
+        lambda r, c: (m - c, m - r),
+    )
+
+
+SYMMETRY_INVERSES = (0, 1, 2, 3, 4, 6, 5, 7)
+
+
+def explicit_solution(n):
+    """
+    Columns of a solution built by the classic closed-form construction (one
+    per row), or None for N = 2 and 3 which have no solution. O(N).
+
+        >>> explicit_solution(8)
+        [1, 3, 5, 7, 2, 0, 6, 4]
+    """
+    if n in (2, 3):
+        return None
+    # 1-based: even columns, then odd ones, with fixes for N mod 6 in {2, 3}
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    if n % 6 == 2:
+        odds = [3, 1] + odds[3:] + [5]
+    elif n % 6 == 3:
+        evens = evens[1:] + [2]
+        odds = odds[2:] + [1, 3]
+    return [c - 1 for c in evens + odds]
+
+
+class Constructive_Solver(N_Queens_Solver):
+    """
+    Places the queens of a closed-form solution in O(N) instead of searching.
+
+    User queens are kept if they all lie on the constructed solution or one
+    of its seven rotations / reflections; otherwise the configured
+    backtracking search completes the board as usual. N = 2 and 3 have no
+    solution and end at once, unsolved.
+    """
+
+    # Columns per row of the constructed board, once it has been placed
+    constructed = None
+
+    def is_solved(self):
+        # A constructed board is safe by construction; checking it again
+        # costs several times as much as building it
+        if self.constructed is not None:
+            return len(self.positions) == self.n
+        return super().is_solved()
+
+    def result(self):
+        if self.constructed is None:
+            return super().result()
+        return SolveResult(
+            self.is_solved(),
+            list(enumerate(self.constructed)),
+            self.step_number,
+            self.queen_placement,
+            self.backtracking,
+        )
+
+    def run(self, check=True):
+        if explicit_solution(self.n) is None:
+            return False  # Nothing to construct, or to find by searching
+        cols = self.construction()
+        if cols is None:
+            return super().run(check)
+        missing = len(cols) - len(self.positions)
+        self.positions.update(enumerate(cols))
+        self.step_number += missing
+        self.queen_placement += missing
+        self.constructed = cols
+        return True
+
+    def steps(self):
+        if explicit_solution(self.n) is None:
+            return
+        cols = self.construction()
+        if cols is None:
+            yield from super().steps()
+            return
+        self.pruned = []
+        for row, col in enumerate(cols):
+            if (row, col) not in self.positions:
+                self.positions.add((row, col))
+                self.step_number += 1
+                self.queen_placement += 1
+                yield SolverEvent(PLACE, row, col)
+        self.constructed = cols
+        yield SolverEvent(SOLUTION, None, None)
+
+    def construction(self):
+        # The symmetric image of the explicit solution that holds every user
+        # queen, as columns per row, or None
+        n = self.n
+        cols = explicit_solution(n)
+        if cols is None or not self.positions:
+            return cols
+        for transform in board_symmetries(n):
+            image = [0] * n
+            for r, c in enumerate(cols):
+                r2, c2 = transform(r, c)
+                image[r2] = c2
+            if all(0 <= r < n and image[r] == c for r, c in self.positions):
+                return image
+        return None
+
+
+# Dropdown label -> solver class
+ALGORITHM_SOLVERS = {
+    "Backtracking": N_Queens_Solver,
+    "Min-Conflicts": Min_Conflicts_Solver,
+    "Constructive": Constructive_Solver,
+}
+ALGORITHMS = list(ALGORITHM_SOLVERS)
+
+
+def create_solver(
+    n,
+    positions=(),
+    algorithm="Backtracking",
+    ordering="MRV + LCV",
+    filtering="Arc Consistency",
+    **options,
+):
+    # `options` go to the solver class, e.g. `seed` or Min-Conflicts' `max_steps`
+    if algorithm not in ALGORITHM_SOLVERS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    return ALGORITHM_SOLVERS[algorithm](
+        n, positions, algorithm, ordering, filtering, **options
+    )
+
+
+def solve(
+    n,
+    initial_positions=(),
+    ordering="MRV + LCV",
+    filtering="Arc Consistency",
+    algorithm="Backtracking",
+    seed=None,
+):
+    """
+    Solve an N-Queens instance headlessly and return a `SolveResult`.
+
+    `initial_positions` is an iterable of (row, col) queens placed by the user;
+    conflicting queens are removed first, then the configured search completes
+    the board (removing further user queens if they make it unsolvable).
+    Randomized solves (Min-Conflicts, "MRV + Random") repeat exactly for the
+    same `seed`.
+    """
+    solver = create_solver(
+        n, initial_positions, algorithm, ordering, filtering, seed=seed
+    )
+    solver.run()
+    return solver.result()
+
+
+### Batch solving ###
+def solve_batch(
+    instances,
+    ordering="MRV + LCV",
+    filtering="Arc Consistency",
+    algorithm="Backtracking",
+    workers=1,
+    seed=None,
+):
+    """
+    Solve many instances, given as (n, initial_positions) pairs, and return a
+    `SolveResult` for each, in order.
+
+    Each board is solved with the synchronous `run()` core and the finished
+    boards are checked together by `verify_solutions` instead of one
+    `is_board_safe` call each. With `workers` > 1 (None for one per CPU) the
+    instances are solved in a process pool. Every instance is solved with
+    the same `seed`.
+    """
+    instances = [(n, tuple(positions)) for n, positions in instances]
+    settings = (algorithm, ordering, filtering, seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        runs = [_run_instance(instance, settings) for instance in instances]
+    else:
+        # Imported here, like NumPy below, to keep the engine quick to import
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            chunksize = max(1, len(instances) // (4 * workers))
+            runs = list(
+                pool.map(
+                    _run_instance,
+                    instances,
+                    [settings] * len(instances),
+                    chunksize=chunksize,
+                )
+            )
+
+    boards = [(n, positions) for (n, _), (positions, *_) in zip(instances, runs)]
+    return [
+        SolveResult(solved, *run)
+        for solved, run in zip(verify_solutions(boards), runs)
+    ]
+
+
+def _run_instance(instance, settings):
+    # (positions, steps, placements, backtracks) of one solved instance
+    n, positions = instance
+    algorithm, ordering, filtering, seed = settings
+    solver = create_solver(n, positions, algorithm, ordering, filtering, seed=seed)
+    # verify_solutions checks the board, so run() doesn't have to
+    solver.run(check=False)
+    return (
+        sorted(solver.positions),
+        solver.step_number,
+        solver.queen_placement,
+        solver.backtracking,
+    )
+
+
+def verify_solutions(boards):
+    """
+    Whether each of `boards`, given as (n, positions) pairs, is a solution:
+    N queens, one per row, column and diagonal.
+
+    Boards of the same N are checked in one vectorized pass over a
+    (boards, N) array holding the column of each row's queen.
+
+        >>> verify_solutions([(4, [(0, 1), (1, 3), (2, 0), (3, 2)]), (4, [(0, 0), (1, 1)])])
+        [True, False]
+    """
+    # Imported here: NumPy is slow to import and only this check needs it
+    import numpy as np
+
+    solved = [False] * len(boards)
+    by_size = defaultdict(list)
+    for index, (n, positions) in enumerate(boards):
+        # Anything but N distinct squares can't be a solution
+        if len(positions) == n and len(set(positions)) == n:
+            by_size[n].append(index)
+
+    for n, indices in by_size.items():
+        queens = np.array(
+            [queen for index in indices for queen in boards[index][1]], dtype=np.int64
+        ).reshape(len(indices), n, 2)
+        rows, cols = queens[..., 0], queens[..., 1]
+        on_board = ((rows >= 0) & (rows < n) & (cols >= 0) & (cols < n)).all(axis=1)
+        # Off-board queens get row N, which no row check accepts
+        board = np.full((len(indices), n + 1), -1, dtype=np.int64)
+        batch = np.arange(len(indices))[:, None]
+        board[batch, np.where(on_board[:, None], rows, n)] = cols
+        board = board[:, :n]
+
+        lines = np.arange(n)
+        ok = on_board & (board >= 0).all(axis=1)
+        ok &= (np.sort(board, axis=1) == lines).all(axis=1)
+        for diagonals in (board - lines, board + lines):
+            ok &= (np.diff(np.sort(diagonals, axis=1), axis=1) != 0).all(axis=1)
+        for index, valid in zip(indices, ok.tolist()):
+            solved[index] = valid
+    return solved
@@ -1,13 +1,36 @@
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from PIL import Image
 from ipywidgets import widgets, Button, HBox, VBox, Layout, Output, Dropdown
 from IPython.display import clear_output, display
 import asyncio
 from IPython.display import display, HTML
 
+from n_queens_engine import (
+    ALGORITHMS,
+    FILTERINGS,
+    ORDERINGS,
+    PLACE,
+    REMOVE,
+    SOLUTION,
+    Conflict_Index,
+    SolverEvent,
+    create_solver,
+)
+from n_queens_cache import Solution_Cache
+from n_queens_trace import Solver_Trace
+
 
 class N_Queens_Playground:
+    # Upper bound on board redraws per second while the solver animates
+    FRAME_RATE = 30
+    # Seed for the randomized solvers, so a cached solve is the one a fresh
+    # solve of the same board would find
+    SOLVER_SEED = 0
+
     def __init__(self):
 
         self.positions = {
@@ -43,6 +66,9 @@ class N_Queens_Playground:
             (4, 12),
             (4, 13),
         }
+        self.conflict_index = Conflict_Index(self.positions)
+        # Decoded once; visualize_board scales it to the board size
+        self.queen_img = Image.open("queen.png").convert("RGBA")
 
         with plt.ioff():
             self.fig, self.ax = plt.subplots(figsize=(3.5, 3.5))
@@ -51,6 +77,7 @@ class N_Queens_Playground:
             self.fig.canvas.footer_visible = False
             self.ax.axis("off")
             self.fig.canvas.mpl_connect("button_press_event", self.onclick)
+            self.fig.canvas.mpl_connect("draw_event", self.on_draw)
 
         self.step_number = 0
         self.queen_placement = 0
@@ -58,6 +85,11 @@ class N_Queens_Playground:
         self.n = 16
         self.hint = False
         self.ai = False
+        # Events of the last solve, replayed through the trace slider
+        self.trace = None
+        self.replaying = False
+        # Finished solves, so repeat (or mirrored) boards are solved at once
+        self.cache = Solution_Cache()
 
         self.steps = widgets.Label(
             value=f"Total Steps: {self.step_number}",
@@ -93,7 +125,7 @@ class N_Queens_Playground:
         self.size = widgets.IntSlider(
             value=self.n,
             min=4,
-            max=16,
+            max=32,
             step=1,
             description="Size of N:",
             style={"font_size": "15px"},
@@ -145,8 +177,25 @@ class N_Queens_Playground:
             [self.steps, self.placements, self.backtracks, self.solution],
             layout=Layout(margin="10px"),
         )
+
+        # Scrub through or replay the last solve without solving again
+        self.replay_slider = widgets.IntSlider(
+            value=0,
+            min=0,
+            max=0,
+            description="Trace:",
+            disabled=True,
+            layout=Layout(width="250px", margin="0 0 0 5px"),
+        )
+        self.replay_slider.observe(self.observe_replay, names="value")
+        self.replay_button = Button(
+            description="Replay", disabled=True, layout=Layout(width="80px")
+        )
+        self.replay_button.on_click(self.on_replay_click)
+        replay_row = HBox([self.replay_slider, self.replay_button])
+
         self.user_control = VBox(
-            [self.size, button_row, stats_box],
+            [self.size, button_row, stats_box, replay_row],
             layout=Layout(margin="0 0 0 75px", overflow="hidden", align_self="center"),
         )
         self.title = VBox([self.title], layout=Layout(margin="35px 0 10px 75px"))
@@ -182,17 +231,34 @@ class N_Queens_Playground:
     def observe_hint(self, change):
         self.hint = change["new"]
         self.visualize_board()
-        self.fig.canvas.draw()
+        self.redraw()
 
     def observe_ai(self, change):
         self.ai = change["new"]
         if self.ai:
+            self.replaying = False
             asyncio.create_task(self.start_ai_solver())
 
+    def observe_replay(self, change):
+        if self.replaying or self.trace is None:
+            return
+        self.positions, placements, removals = self.trace.state_at(change["new"])
+        self.conflict_index = Conflict_Index(self.positions)
+        self.show_stats(placements + removals, placements, removals)
+        self.visualize_board()
+        self.redraw()
+
+    def on_replay_click(self, b):
+        if self.replaying:
+            self.replaying = False
+        elif self.trace is not None and not self.ai:
+            asyncio.create_task(self.replay())
+
     def new_reset(self, change=None):
 
         self.n = self.size.value
         self.positions.clear()
+        self.conflict_index = Conflict_Index()
         self.step_number = 0
         self.backtracking = 0
         self.queen_placement = 0
@@ -201,129 +267,165 @@ class N_Queens_Playground:
         self.placements.value = f"Total Queen Placements: {self.queen_placement}"
         self.backtracks.value = f"Total Backtracking Steps: {self.backtracking}"
         self.ai_check.value = False
+        self.replaying = False
+        self.trace = None
+        self.replay_slider.value = 0
+        self.replay_slider.disabled = True
+        self.replay_button.disabled = True
         self.visualize_board()
-        self.fig.canvas.draw()
-
-    def visualize_board(self):
-        board = np.zeros((self.n, self.n))
-        board[1::2, ::2] = 1
-        board[::2, 1::2] = 1
-        queen_img = plt.imread("queen.png")
-        zoom_factor = 0.05 * 6 / self.n
+        self.redraw()
 
+    def setup_board(self):
+        # Build the persistent artists for the current N; redraws only update them
         self.ax.clear()
-        for y in range(self.n):
-            for x in range(self.n):
-                color = "#769656" if board[y, x] == 1 else "#eeeed2"
-                self.ax.fill_between(
-                    [x, x + 1], y, y + 1, color=color, edgecolor="none"
-                )
+        self.board_n = self.n
+        # Blitting backends redraw the artists that change on top of a cached
+        # background, the others (ipympl) redraw the whole figure on idle
+        self.blit = self.fig.canvas.supports_blit
+        self.background = None
+
+        board = np.zeros((self.n, self.n), dtype=bool)
+        board[1::2, ::2] = True
+        board[::2, 1::2] = True
+        self.board_artist = self.ax.imshow(
+            np.where(board[..., None], to_rgb("#769656"), to_rgb("#eeeed2")),
+            extent=(0, self.n, self.n, 0),
+            interpolation="nearest",
+        )
+        self.hint_artist = self.ax.imshow(
+            np.zeros((self.n, self.n, 3)),
+            extent=(0, self.n, self.n, 0),
+            interpolation="nearest",
+            visible=False,
+            animated=self.blit,
+        )
+        # Grid lines go over the hint heatmap, so they are redrawn with it
+        lines = [[(i, 0), (i, self.n)] for i in range(self.n + 1)]
+        lines += [[(0, i), (self.n, i)] for i in range(self.n + 1)]
+        self.grid_artist = self.ax.add_collection(
+            LineCollection(lines, colors="black", linewidths=0.5, animated=self.blit)
+        )
+        self.queen_artists = []
+        self.sprite_key = None
 
         self.ax.set_xlim(0, self.n)
         self.ax.set_ylim(0, self.n)
         self.ax.set_xticks([])
         self.ax.set_yticks([])
-        # Optionally, add grid lines
-        self.ax.set_xticks([i for i in range(self.n + 1)])
-        self.ax.set_yticks([i for i in range(self.n + 1)])
-        self.ax.grid(which="both", color="black", linestyle="-", linewidth=0.5)
-        self.ax.set_xticklabels([])
-        self.ax.set_yticklabels([])
         self.ax.set_aspect("equal")
         self.ax.invert_yaxis()
         self.fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
 
-        if self.hint:
-            # Optionally, add grid lines
-            self.ax.set_xticks([i for i in range(self.n + 1)])
-            self.ax.set_yticks([i for i in range(self.n + 1)])
-            self.ax.grid(which="both", color="black", linestyle="-", linewidth=0.5)
-            self.ax.set_xticklabels([])
-            self.ax.set_yticklabels([])
-            self.ax.set_aspect("equal")
-
-            max_threat = max(
-                self.compute_threats(y, x) for y in range(self.n) for x in range(self.n)
-            )
-
-            for y in range(self.n):
-                for x in range(self.n):
-
-                    threat = self.compute_threats(y, x)
-                    if threat == 0:
-                        color = "#5ced73"  # Green for no threat
-                    else:
-                        # Calculate the intensity of red based on the threat level
-                        intensity = 255 - int(255 * (threat / max_threat))
-                        color = f"#FF{intensity:02X}{intensity:02X}"  # Gradient of red
-                    self.ax.add_patch(plt.Rectangle((x, y), 1, 1, color=color))
+    def visualize_board(self):
+        if self.n != getattr(self, "board_n", None):
+            self.setup_board()
 
-        for y, x in self.positions:
-            img = OffsetImage(queen_img, zoom=zoom_factor)
+        if self.hint:
+            self.hint_artist.set_data(self.hint_image())
+        self.hint_artist.set_visible(self.hint)
+
+        if (self.n, self.fig.dpi) != self.sprite_key:
+            self.scale_queen_sprite()
+            for ab in self.queen_artists:
+                ab.remove()
+            self.queen_artists = []
+
+        # Queen artists are pooled: reposition one per queen, hide the rest
+        positions = list(self.positions)
+        while len(self.queen_artists) < len(positions):
+            img = OffsetImage(self.queen_sprite, zoom=self.sprite_zoom)
             ab = AnnotationBbox(
-                img, (x + 0.5, y + 0.5), frameon=False, boxcoords="data", pad=0
+                img,
+                (0, 0),
+                frameon=False,
+                boxcoords="data",
+                pad=0,
+                animated=self.blit,
             )
             self.ax.add_artist(ab)
-
-    def compute_threats(self, row, col):
-        threats = 0
-        for y, x in self.positions:
-
-            if y == row or x == col or abs(y - row) == abs(x - col):
-                threats += 1
-
-            if (row, col) == (y, x):
-                threats -= 1
-
+            self.queen_artists.append(ab)
+        for i, ab in enumerate(self.queen_artists):
+            if i < len(positions):
+                y, x = positions[i]
+                ab.xy = ab.xybox = (x + 0.5, y + 0.5)
+            ab.set_visible(i < len(positions))
+
+    def scale_queen_sprite(self):
+        # Resample the decoded queen image to its on-screen size for this N
+        # once, instead of matplotlib resampling the full-size PNG every frame
+        zoom_factor = 0.05 * 6 / self.n
+        width, height = self.queen_img.size
+        scale = zoom_factor * self.fig.dpi / 72
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        self.queen_sprite = np.asarray(self.queen_img.resize(size, Image.LANCZOS))
+        # Same displayed size as the full-size image at zoom_factor
+        self.sprite_zoom = zoom_factor * width / size[0]
+        self.sprite_key = (self.n, self.fig.dpi)
+
+    def redraw(self):
+        canvas = self.fig.canvas
+        if not self.blit:
+            canvas.draw_idle()
+        elif self.background is None:
+            # A full draw caches the background through on_draw
+            canvas.draw()
+        else:
+            canvas.restore_region(self.background)
+            self.draw_animated()
+            canvas.blit(self.fig.bbox)
+
+    def on_draw(self, event):
+        # Full redraws (first frame, resizes) leave the animated artists out
+        if getattr(self, "blit", False):
+            self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+            self.draw_animated()
+
+    def draw_animated(self):
+        for artist in [self.hint_artist, self.grid_artist, *self.queen_artists]:
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+
+    def hint_image(self):
+        return self.heatmap_image(self.compute_threat_matrix())
+
+    def heatmap_image(self, threats):
+        # Green for no threat, otherwise a gradient of red by threat level
+        max_threat = max(threats.max(), 1)
+        intensity = (255 - 255 * threats // max_threat) / 255
+        image = np.stack([np.ones_like(intensity), intensity, intensity], axis=-1)
+        image[threats == 0] = to_rgb("#5ced73")
+        return image
+
+    def compute_threat_matrix(self):
+        # Queens attacking each square. Two lines through a square only meet
+        # there, so this is the sum of the queens on its row, column and
+        # diagonals, less the four lines of a queen standing on it.
+        n = self.n
+        if not self.positions:
+            return np.zeros((n, n), dtype=int)
+        rows, cols = np.array(list(self.positions)).T
+        r = np.arange(n)[:, None]
+        c = np.arange(n)
+        threats = (
+            np.bincount(rows, minlength=n)[r]
+            + np.bincount(cols, minlength=n)[c]
+            + np.bincount(cols - rows + n - 1, minlength=2 * n - 1)[c - r + n - 1]
+            + np.bincount(rows + cols, minlength=2 * n - 1)[r + c]
+        )
+        threats[rows, cols] -= 4
         return threats
 
     def is_board_safe(self):
         """
         Check if the entire board is safe (no queens threaten each other).
         """
-
-        for row1, col1 in self.positions:
-            for row2, col2 in self.positions:
-                if (row1, col1) != (row2, col2):
-                    if (
-                        row1 == row2
-                        or col1 == col2
-                        or abs(row1 - row2) == abs(col1 - col2)
-                    ):
-                        return False
-        return True
+        return self.conflict_index.conflicts == 0
 
     def find_most_conflict(self):
-        most_conflict = (-1, -1)
-        conflict = 0
-        max = -1
-        for row1, col1 in self.positions:
-            for row2, col2 in self.positions:
-                if (row1, col1) != (row2, col2):
-                    if (
-                        row1 == row2
-                        or col1 == col2
-                        or abs(row1 - row2) == abs(col1 - col2)
-                    ):
-                        conflict += 1
-                if conflict > max:
-                    max = conflict
-                    most_conflict = (row1, col1)
-
-        return most_conflict
+        return self.conflict_index.find_most_conflict(self.positions)
 
     def count_conflicts(self):
-        conflict = 0
-        for row1, col1 in self.positions:
-            for row2, col2 in self.positions:
-                if (row1, col1) != (row2, col2):
-                    if (
-                        row1 == row2
-                        or col1 == col2
-                        or abs(row1 - row2) == abs(col1 - col2)
-                    ):
-                        conflict += 1
-        return conflict
+        return self.conflict_index.conflicts
 
     def onclick(self, event):
         if event.inaxes and event.xdata is not None and event.ydata is not None:
@@ -332,11 +434,13 @@ class N_Queens_Playground:
                 self.n * self.n
             ):
                 self.positions.add((row, col))
+                self.conflict_index.add(row, col)
                 self.queen_placement += 1
                 self.step_number += 1
 
             elif (row, col) in self.positions:
                 self.positions.remove((row, col))
+                self.conflict_index.remove(row, col)
                 self.backtracking += 1
                 self.step_number += 1
 
@@ -345,7 +449,7 @@ class N_Queens_Playground:
             self.backtracks.value = f"Total Backtracking Steps: {self.backtracking}"
 
             self.visualize_board()
-            self.fig.canvas.draw()
+            self.redraw()
 
             if len(self.positions) == self.n and self.count_conflicts() == 0:
 
@@ -444,7 +548,7 @@ class N_Queens_Playground:
         )
 
         self.algorithm_dropdown = Dropdown(
-            options=["Backtracking"],
+            options=ALGORITHMS,
             value="Backtracking",
             description="Algorithm:",
             disabled=False,
@@ -452,7 +556,7 @@ class N_Queens_Playground:
         )
 
         self.ordering_dropdown = Dropdown(
-            options=["None", "MRV", "LCV", "MRV + LCV"],
+            options=ORDERINGS,
             value="MRV + LCV",
             description="Ordering:",
             disabled=False,
@@ -460,7 +564,7 @@ class N_Queens_Playground:
         )
 
         self.filtering_dropdown = Dropdown(
-            options=["None", "Forward Checking", "Arc Consistency"],
+            options=FILTERINGS,
             value="Arc Consistency",
             description="Filtering:",
             disabled=False,
@@ -468,7 +572,7 @@ class N_Queens_Playground:
         )
 
         self.speed_dropdown = Dropdown(
-            options=["1x", "2x", "4x", "8x", "∞"],
+            options=["1x", "2x", "4x", "8x", "32x", "128x", "∞"],
             value="1x",
             description="Speed:",
             disabled=False,
@@ -559,1161 +663,176 @@ class N_Queens_Playground:
             display(self.config_ui)
 
     def speed_check(self):
-        if self.speed_dropdown.value == "1x":
-            return 1
-        elif self.speed_dropdown.value == "2x":
-            return 2
-        elif self.speed_dropdown.value == "4x":
-            return 4
-        elif self.speed_dropdown.value == "8x":
-            return 8
-        else:
-            return 0
-
-    async def solve(self):
-
-        self.board = [[0] * self.n for _ in range(self.n)]
-        for r, c in self.positions:
-            self.board[r][c] = 1
-
-        self.update_threats_matrix()
-        self.used_rows = set(r for (r, c) in self.positions)
-
-        algorithm = self.algorithm_dropdown.value
-        ordering = self.ordering_dropdown.value
-        filtering = self.filtering_dropdown.value
-
-        conflicts = self.count_conflicts()
-        while conflicts != 0 and self.ai:
-            row, col = self.find_most_conflict()
-            # Backtracking
-            self.board[row][col] = 0  # Remove the Queen
-            # Backtrack threats
-            self.backtrack_threats(self.threats, row, col)
-            self.positions.remove((row, col))  # Remove Queen position
-
-            used = True
-
-            for y, x in self.positions:
-                if y == row:
-                    used = False
-            if used:
-                self.used_rows.remove(row)  # Remove row from used rows
-
-            conflicts = self.count_conflicts()
-
-            self.step_number += 1  # Update total step counter
-            self.backtracking += 1  # Update backtracking step counter
-
-            time = self.speed_check()
-            if time != 0:
-                self.steps.value = f"Total Steps: {self.step_number}"
-                self.backtracks.value = f"Total Backtracking Steps: {self.backtracking}"
-                self.visualize_board()
-                self.fig.canvas.draw()
-                await asyncio.sleep(1 / time)
-
-        # Call the appropriate solver method based on the configuration
-        if algorithm == "Backtracking":
-            if ordering == "MRV + LCV" and filtering == "Arc Consistency":
-                solver = await self.solve_n_queens_util_mrv_lcv_ac()
-            if ordering == "MRV + LCV" and filtering == "Forward Checking":
-                solver = await self.solve_n_queens_util_mrv_lcv_fc()
-            if ordering == "MRV + LCV" and filtering == "None":
-                solver = await self.solve_n_queens_util_mrv_lcv()
-
-            if ordering == "MRV" and filtering == "Arc Consistency":
-                solver = await self.solve_n_queens_util_mrv_ac()
-            if ordering == "MRV" and filtering == "Forward Checking":
-                solver = await self.solve_n_queens_util_mrv_fc()
-            if ordering == "MRV" and filtering == "None":
-                solver = await self.solve_n_queens_util_mrv()
-
-            if ordering == "LCV" and filtering == "Forward Checking":
-                solver = await self.solve_n_queens_util_lcv_fc()
-            if ordering == "LCV" and filtering == "Arc Consistency":
-                solver = await self.solve_n_queens_util_lcv_ac()
-            if ordering == "LCV" and filtering == "None":
-                solver = await self.solve_n_queens_util_lcv()
-
-            if ordering == "None" and filtering == "Arc Consistency":
-                solver = await self.solve_n_queens_util_ac()
-            if ordering == "None" and filtering == "Forward Checking":
-                solver = await self.solve_n_queens_util_fc()
-            if ordering == "None" and filtering == "None":
-                solver = await self.solve_n_queens_util_backtracking()
-
-        while not solver and self.ai:
-
-            row, col = self.find_queen_to_remove()
-
-            # Remove the queen that opens up most safe spots
-            self.positions.remove((row, col))
-            self.used_rows.remove(row)
-            self.board[row][col] = 0
-            self.backtrack_threats(self.threats, row, col)
-
-            self.step_number += 1
-            self.backtracking += 1
-
-            time = self.speed_check()
-            if time != 0:
-                self.steps.value = f"Total Steps: {self.step_number}"
-                self.backtracks.value = f"Total Backtracking Steps: {self.backtracking}"
-                self.visualize_board()
-                self.fig.canvas.draw()
-                await asyncio.sleep(1 / time)
-
-            if algorithm == "Backtracking":
-                if ordering == "MRV + LCV" and filtering == "Arc Consistency":
-                    solver = await self.solve_n_queens_util_mrv_lcv_ac()
-                if ordering == "MRV + LCV" and filtering == "Forward Checking":
-                    solver = await self.solve_n_queens_util_mrv_lcv_fc()
-                if ordering == "MRV + LCV" and filtering == "None":
-                    solver = await self.solve_n_queens_util_mrv_lcv()
-
-                if ordering == "MRV" and filtering == "Arc Consistency":
-                    solver = await self.solve_n_queens_util_mrv_ac()
-                if ordering == "MRV" and filtering == "Forward Checking":
-                    solver = await self.solve_n_queens_util_mrv_fc()
-                if ordering == "MRV" and filtering == "None":
-                    solver = await self.solve_n_queens_util_mrv()
-
-                if ordering == "LCV" and filtering == "Arc Consistency":
-                    solver = await self.solve_n_queens_util_lcv_ac()
-                if ordering == "LCV" and filtering == "Forward Checking":
-                    solver = await self.solve_n_queens_util_lcv_fc()
-                if ordering == "LCV" and filtering == "None":
-                    solver = await self.solve_n_queens_util_lcv()
-
-                if ordering == "None" and filtering == "Arc Consistency":
-                    solver = await self.solve_n_queens_util_ac()
-                if ordering == "None" and filtering == "Forward Checking":
-                    solver = await self.solve_n_queens_util_fc()
-                if ordering == "None" and filtering == "None":
-                    solver = await self.solve_n_queens_util_backtracking()
-
-        if self.ai and len(self.positions) == self.n and self.count_conflicts() == 0:
-
-            self.solution.value = '<span style="color:#769656; font-weight:bold; font-size:15px;">Solution Found!</span>'
-        self.visualize_board()
-        self.fig.canvas.draw()
-
-    ### Backtracking
-    async def solve_n_queens_util_backtracking(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
-
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_fc(row + 1):
-                    return True
-            else:
-                for col in range(self.n):
-                    if self.is_safe(self.board, row, col):
-                        if self.ai:
-                            # Queen Placement
-                            self.board[row][col] = 1  # Place the queen
-                            self.update_threats(
-                                self.threats, row, col
-                            )  # Update threats
-                            self.positions.add((row, col))  # Add Queen position
-                            self.used_rows.add(row)  # Add row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.queen_placement += 1  # Update Queen placement counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-                        if await self.solve_n_queens_util_backtracking(row + 1):
-                            return True
-
-                        if self.ai:
-                            # Backtracking
-                            self.board[row][col] = 0  # Remove the Queen
-                            # Backtrack threats
-                            self.backtrack_threats(self.threats, row, col)
-                            self.positions.remove((row, col))  # Remove Queen position
-                            self.used_rows.remove(row)  # Remove row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.backtracking += 1  # Update backtracking step counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-                                await asyncio.sleep(1 / time)
-
-        return False
-
-    ### FC
-    async def solve_n_queens_util_fc(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
-
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_fc(row + 1):
-                    return True
-            else:
-                if self.forward_checking():
-
-                    row_threats = self.threats[row]
-
-                    safe_cols = [
-                        index
-                        for index, threats in enumerate(row_threats)
-                        if threats == 0
-                    ]
-
-                    for col in safe_cols:
-
-                        if self.ai:
-                            # Queen Placement
-                            self.board[row][col] = 1  # Place the queen
-                            self.update_threats(
-                                self.threats, row, col
-                            )  # Update threats
-                            self.positions.add((row, col))  # Add Queen position
-                            self.used_rows.add(row)  # Add row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.queen_placement += 1  # Update Queen placement counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-                        if await self.solve_n_queens_util_fc(row + 1):
-                            return True
-
-                        if self.ai:
-                            # Backtracking
-                            self.board[row][col] = 0  # Remove the Queen
-                            # Backtrack threats
-                            self.backtrack_threats(self.threats, row, col)
-                            self.positions.remove((row, col))  # Remove Queen position
-                            self.used_rows.remove(row)  # Remove row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.backtracking += 1  # Update backtracking step counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-                else:
-                    return False
-        return False
-
-    ### AC
-    async def solve_n_queens_util_ac(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
-
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_ac(row + 1):
-                    return True
-            else:
-
-                prune = self.arc_consistency(row)
-
-                row_threats = self.threats[row]
-
-                safe_cols = [
-                    index for index, threats in enumerate(row_threats) if threats == 0
-                ]
-
-                for col in safe_cols:
-                    if col not in prune:  # Check whether a column is pruned off
-
-                        if self.ai:
-                            # Queen Placement
-                            self.board[row][col] = 1  # Place the queen
-                            self.update_threats(
-                                self.threats, row, col
-                            )  # Update threats
-                            self.positions.add((row, col))  # Add Queen position
-                            self.used_rows.add(row)  # Add row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.queen_placement += 1  # Update Queen placement counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-                        if await self.solve_n_queens_util_ac(row + 1):
-                            return True
-
-                        if self.ai:
-                            # Backtracking
-                            self.board[row][col] = 0  # Remove the Queen
-                            # Backtrack threats
-                            self.backtrack_threats(self.threats, row, col)
-                            self.positions.remove((row, col))  # Remove Queen position
-                            self.used_rows.remove(row)  # Remove row from used rows
-                            self.step_number += 1  # Update total step counter
-                            self.backtracking += 1  # Update backtracking step counter
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-        return False
-
-    ### LCV
-    async def solve_n_queens_util_lcv(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
-
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_lcv(row + 1):
-                    return True
-            else:
-
-                # Store a list of safe columns and number of remaining safe spots
-                col_lcv = []
-                for col in range(self.n):
-                    if self.is_safe(self.board, row, col):
-                        lcv = self.count_safe_spots_for_board(row, col)
-                        col_lcv.append((col, lcv))
-
-                # Sort the safe col in ascending order based on number of safe spots
-                col_lcv.sort(key=lambda x: x[1])
-
-                # Try Queen placement in each safe column (in LCV order) in this row
-                for col, _ in col_lcv:
-                    if self.ai:
-                        self.board[row][col] = 1
-                        self.update_threats(self.threats, row, col)
-                        self.positions.add((row, col))
-                        self.used_rows.add(row)
-
-                        self.step_number += 1
-                        self.queen_placement += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    if await self.solve_n_queens_util_lcv(row + 1):
-                        return True
-
-                    if self.ai and (row in self.used_rows):
-
-                        self.board[row][col] = 0
-                        self.backtrack_threats(self.threats, row, col)
-                        self.positions.remove((row, col))
-                        self.used_rows.remove(row)
-
-                        self.step_number += 1
-                        self.backtracking += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-        return False
-
-    ### MRV
-    async def solve_n_queens_util_mrv(self):
-        if self.ai:
-
-            # Base Case: all rows are occupied
-            if len(self.used_rows) == self.n:
-                return True
-
-            # Find the target row with minimum remaining safe spots
-            mrv_row = self.find_row_with_mrv()
-
-            # Try Queen placement in each safe spot/column in this row
-            for col in range(self.n):
-                if self.is_safe(self.board, mrv_row, col):
-                    if self.ai:
-                        # Queen Placement
-                        self.board[mrv_row][col] = 1  # Place the queen
-                        self.update_threats(
-                            self.threats, mrv_row, col
-                        )  # Update threats
-                        self.positions.add((mrv_row, col))  # Add Queen position
-                        self.used_rows.add(mrv_row)  # Add row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.queen_placement += 1  # Update Queen placement counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    # Recursively call function onto next row
-                    if await self.solve_n_queens_util_mrv():
-                        return True
-
-                    if self.ai:
-                        # Backtracking
-                        self.board[mrv_row][col] = 0  # Remove the Queen
-                        self.backtrack_threats(
-                            self.threats, mrv_row, col
-                        )  # Backtrack threats
-                        self.positions.remove((mrv_row, col))  # Remove Queen position
-                        self.used_rows.remove(mrv_row)  # Remove row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.backtracking += 1  # Update backtracking step counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-        return False
-
-    ### MRV + LCV
-    async def solve_n_queens_util_mrv_lcv(self):
-        if self.ai:
-
-            if len(self.used_rows) == self.n:
-                return True
-
-            mrv_row = self.find_row_with_mrv()
-            col_lcv = []
-            for col in range(self.n):
-                if self.is_safe(self.board, mrv_row, col):
-                    lcv = self.count_safe_spots_for_board(mrv_row, col)
-                    col_lcv.append((col, lcv))
-            col_lcv.sort(key=lambda x: x[1])
-
-            for col, _ in col_lcv:
-                if self.ai:
-                    self.board[mrv_row][col] = 1
-                    self.update_threats(self.threats, mrv_row, col)
-                    self.positions.add((mrv_row, col))
-                    self.used_rows.add(mrv_row)
-
-                    self.step_number += 1
-                    self.queen_placement += 1
-
-                    time = self.speed_check()
-                    if time != 0:
-                        self.steps.value = f"Total Steps: {self.step_number}"
-                        self.placements.value = (
-                            f"Total Queen Placements: {self.queen_placement}"
-                        )
-                        self.backtracks.value = (
-                            f"Total Backtracking Steps: {self.backtracking}"
-                        )
-                        self.visualize_board()
-                        self.fig.canvas.draw()
-
-                        await asyncio.sleep(1 / time)
-
-                if await self.solve_n_queens_util_mrv_lcv():
-                    return True
-
-                if self.ai:
-                    self.board[mrv_row][col] = 0
-                    self.backtrack_threats(self.threats, mrv_row, col)
-                    self.positions.remove((mrv_row, col))
-                    self.used_rows.remove(mrv_row)
-
-                    self.step_number += 1
-                    self.backtracking += 1
-
-                    time = self.speed_check()
-                    if time != 0:
-                        self.steps.value = f"Total Steps: {self.step_number}"
-                        self.placements.value = (
-                            f"Total Queen Placements: {self.queen_placement}"
-                        )
-                        self.backtracks.value = (
-                            f"Total Backtracking Steps: {self.backtracking}"
-                        )
-                        self.visualize_board()
-                        self.fig.canvas.draw()
-
-                        await asyncio.sleep(1 / time)
-
-        return False
-
-    ### LCV + AC
-    async def solve_n_queens_util_lcv_ac(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
+        # Solver steps per second, 0 for no animation
+        speeds = {"1x": 1, "2x": 2, "4x": 4, "8x": 8, "32x": 32, "128x": 128}
+        return speeds.get(self.speed_dropdown.value, 0)
+
+    def show_stats(self, step_number, queen_placement, backtracking):
+        self.steps.value = f"Total Steps: {step_number}"
+        self.placements.value = f"Total Queen Placements: {queen_placement}"
+        self.backtracks.value = f"Total Backtracking Steps: {backtracking}"
+
+    async def render_frames(self, frames):
+        loop = asyncio.get_running_loop()
+        while True:
+            stats = await frames.get()
+            frame_start = loop.time()
+            # Only the latest stats are drawn; None marks the end of the run
+            while not frames.empty():
+                stats = frames.get_nowait()
+            if stats is None:
+                return
+
+            self.show_stats(*stats)
+            self.visualize_board()
+            self.redraw()
+            await asyncio.sleep(frame_start + 1 / self.FRAME_RATE - loop.time())
+
+    async def animate(self, moves, running):
+        # `moves` makes one queen move per item and yields the stats to show.
+        # Moves run on their own schedule and queue their stats for the
+        # renderer, which draws at most FRAME_RATE frames a second and skips
+        # the moves finished in between.
+        frames = asyncio.Queue()
+        renderer = asyncio.create_task(self.render_frames(frames))
+        loop = asyncio.get_running_loop()
+        start, done, pace = loop.time(), 0, None
+        for stats in moves:
+            frames.put_nowait(stats)
+
+            if not running():
+                break
 
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_lcv_fc(row + 1):
-                    return True
+            speed = self.speed_check()
+            if speed != pace:
+                start, done, pace = loop.time(), 0, speed
+            if speed != 0:
+                done += 1
+                delay = start + done / speed - loop.time()
+                if delay < -0.25:
+                    # Fell well behind (a slow frame): carry on from now
+                    # rather than bursting through the backlog
+                    start, done = loop.time(), 0
+                await asyncio.sleep(max(delay, 0))
+
+        frames.put_nowait(None)
+        await renderer
+
+    def solver_moves(self, solver):
+        # Step the solver, tracing every event; yield after each queen move
+        step_number = self.step_number
+        queen_placement = self.queen_placement
+        backtracking = self.backtracking
+        for event in solver.steps():
+            self.trace.append(event)
+            # Only queen moves are animation steps
+            if event.kind in (PLACE, REMOVE):
+                self.step_number = step_number + solver.step_number
+                self.queen_placement = queen_placement + solver.queen_placement
+                self.backtracking = backtracking + solver.backtracking
+                yield self.step_number, self.queen_placement, self.backtracking
+
+    def trace_moves(self, start):
+        # Apply the traced events from `start` on; yield after each queen move
+        self.positions, placements, removals = self.trace.state_at(start)
+        for index in range(start, len(self.trace)):
+            kind, row, col = self.trace[index]
+            self.replay_index = index + 1
+            if kind == PLACE:
+                self.positions.add((row, col))
+                placements += 1
+            elif kind == REMOVE:
+                self.positions.discard((row, col))
+                removals += 1
             else:
+                continue
+            yield placements + removals, placements, removals
+
+    async def replay(self):
+        start = self.replay_slider.value
+        if start >= len(self.trace):
+            start = 0
+        self.replaying = True
+        self.replay_button.description = "Stop"
+        self.replay_index = start
+        if self.speed_check() != 0:
+            await self.animate(self.trace_moves(start), lambda: self.replaying)
+        else:
+            self.replay_index = len(self.trace)
 
-                # Find the list of safe columns to prune off
-                prune = self.arc_consistency(row)
-
-                # Store a list of safe columns and number of remaining safe spots
-                col_lcv = []
-                for col in range(self.n):
-                    if self.is_safe(self.board, row, col):
-                        lcv = self.count_safe_spots_for_board(row, col)
-                        col_lcv.append((col, lcv))
-
-                # Sort the safe col in ascending order based on number of safe spots
-                col_lcv.sort(key=lambda x: x[1])
-
-                # Try Queen placement in each safe column (in LCV order) in this row
-                for col, _ in col_lcv:
-                    if col not in prune:  # Check whether a column is pruned off
-                        if self.ai:
-                            self.board[row][col] = 1
-                            self.update_threats(self.threats, row, col)
-                            self.positions.add((row, col))
-                            self.used_rows.add(row)
-
-                            self.step_number += 1
-                            self.queen_placement += 1
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-                        if await self.solve_n_queens_util_lcv_ac(row + 1):
-                            return True
-
-                        if self.ai and (row in self.used_rows):
-
-                            self.board[row][col] = 0
-                            self.backtrack_threats(self.threats, row, col)
-                            self.positions.remove((row, col))
-                            self.used_rows.remove(row)
-
-                            self.step_number += 1
-                            self.backtracking += 1
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-        return False
-
-    ### LCV + FC
-    async def solve_n_queens_util_lcv_fc(self, row=0):
-        if self.ai:
-            if row >= self.n:
-                return True
+        self.replaying = False
+        self.replay_button.description = "Replay"
+        # Leave the slider (and through it the board) where the replay stopped
+        if self.replay_slider.value != self.replay_index:
+            self.replay_slider.value = self.replay_index
+        else:
+            self.observe_replay({"new": self.replay_index})
+
+    def show_result(self, result):
+        # Jump straight to a finished solve (cached, or run at max speed); the
+        # trace holds just the queens taken off and put down to get there
+        final = set(result.positions)
+        for row, col in sorted(self.positions - final):
+            self.trace.append(SolverEvent(REMOVE, row, col))
+        for row, col in sorted(final - self.positions):
+            self.trace.append(SolverEvent(PLACE, row, col))
+        if result.solved:
+            self.trace.append(SolverEvent(SOLUTION, None, None))
+
+        self.positions = final
+        self.step_number += result.steps
+        self.queen_placement += result.placements
+        self.backtracking += result.backtracks
+        self.show_stats(self.step_number, self.queen_placement, self.backtracking)
 
-            if row in self.used_rows:
-                if await self.solve_n_queens_util_lcv_fc(row + 1):
-                    return True
-            else:
-                # Filtering: Forward Checking
-                if self.forward_checking():
-
-                    col_lcv = []
-                    for col in range(self.n):
-                        if self.is_safe(self.board, row, col):
-                            lcv = self.count_safe_spots_for_board(row, col)
-                            col_lcv.append((col, lcv))
-                    col_lcv.sort(key=lambda x: x[1])
-
-                    for col, _ in col_lcv:
-                        if self.ai:
-                            self.board[row][col] = 1
-                            self.update_threats(self.threats, row, col)
-                            self.positions.add((row, col))
-                            self.used_rows.add(row)
-
-                            self.step_number += 1
-                            self.queen_placement += 1
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-
-                        if await self.solve_n_queens_util_lcv_fc(row + 1):
-                            return True
-
-                        if self.ai and (row in self.used_rows):
-
-                            self.board[row][col] = 0
-                            self.backtrack_threats(self.threats, row, col)
-                            self.positions.remove((row, col))
-                            self.used_rows.remove(row)
-
-                            self.step_number += 1
-                            self.backtracking += 1
-
-                            time = self.speed_check()
-                            if time != 0:
-                                self.steps.value = f"Total Steps: {self.step_number}"
-                                self.placements.value = (
-                                    f"Total Queen Placements: {self.queen_placement}"
-                                )
-                                self.backtracks.value = (
-                                    f"Total Backtracking Steps: {self.backtracking}"
-                                )
-                                self.visualize_board()
-                                self.fig.canvas.draw()
-
-                                await asyncio.sleep(1 / time)
-                else:
-                    return False
-
-        return False
-
-    ### MRV + LCV + FC
-    async def solve_n_queens_util_mrv_lcv_fc(self):
-        if self.ai:
-            if len(self.used_rows) == self.n:
-                return True
-
-            # Filtering: Forward Checking
-            if self.forward_checking():
-                # Find the target row with minimum remaining safe spots
-                mrv_row = self.find_row_with_mrv()
-
-                col_lcv = []
-                for col in range(self.n):
-                    if self.is_safe(self.board, mrv_row, col):
-                        lcv = self.count_safe_spots_for_board(mrv_row, col)
-                        col_lcv.append((col, lcv))
-                col_lcv.sort(key=lambda x: x[1])
-
-                for col, _ in col_lcv:
-                    if self.ai:
-                        self.board[mrv_row][col] = 1
-                        self.update_threats(self.threats, mrv_row, col)
-                        self.positions.add((mrv_row, col))
-                        self.used_rows.add(mrv_row)
-
-                        self.step_number += 1
-                        self.queen_placement += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    if await self.solve_n_queens_util_mrv_lcv_fc():
-                        return True
-                    if self.ai:
-
-                        self.board[mrv_row][col] = 0
-                        self.backtrack_threats(self.threats, mrv_row, col)
-                        self.positions.remove((mrv_row, col))
-                        self.used_rows.remove(mrv_row)
-
-                        self.step_number += 1
-                        self.backtracking += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
+    async def solve(self):
+        settings = (
+            self.algorithm_dropdown.value,
+            self.ordering_dropdown.value,
+            self.filtering_dropdown.value,
+        )
+        self.trace = Solver_Trace(self.n, self.positions)
+        cached = self.cache.get(
+            self.n, self.positions, *settings, seed=self.SOLVER_SEED
+        )
+        if cached is not None:
+            self.show_result(cached)
+        else:
+            solver = create_solver(
+                self.n, self.positions, *settings, seed=self.SOLVER_SEED
+            )
+            if self.speed_check() == 0:
+                # Max speed: the uninstrumented core, only the result is shown
+                solver.run()
+                self.show_result(solver.result())
             else:
-                return False
-
-        return False
+                # Share the solver's positions so every redraw shows the live
+                # search state
+                self.positions = solver.positions
+                await self.animate(self.solver_moves(solver), lambda: self.ai)
+
+            # Runs cut short by turning the AI off aren't worth keeping
+            if solver.is_solved():
+                self.cache.put(
+                    self.n,
+                    self.trace.initial_positions,
+                    solver.result(),
+                    *settings,
+                    seed=self.SOLVER_SEED,
+                )
 
-    ### MRV + FC
-    async def solve_n_queens_util_mrv_fc(self):
-        if self.ai:
-            if len(self.used_rows) == self.n:
-                return True
-
-            # Filtering: Forward Checking
-            if self.forward_checking():
-                # Find the target row with minimum remaining safe spots
-                mrv_row = self.find_row_with_mrv()
-
-                row_threats = self.threats[mrv_row]  # Threats value for current row
-                # Extract index of safe columns based on row threats list
-                safe_cols = [
-                    index for index, threats in enumerate(row_threats) if threats == 0
-                ]
-
-                # Try Queen placement in each safe column in this row
-                for col in safe_cols:
-                    if self.ai:
-                        # Queen Placement
-                        self.board[mrv_row][col] = 1  # Place the queen
-                        self.update_threats(
-                            self.threats, mrv_row, col
-                        )  # Update threats
-                        self.positions.add((mrv_row, col))  # Add Queen position
-                        self.used_rows.add(mrv_row)  # Add row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.queen_placement += 1  # Update Queen placement counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    # Recursively call function onto next row
-                    if await self.solve_n_queens_util_mrv_fc():
-                        return True
-
-                    if self.ai:
-                        # Backtracking
-                        self.board[mrv_row][col] = 0  # Remove the Queen
-                        self.backtrack_threats(
-                            self.threats, mrv_row, col
-                        )  # Backtrack threats
-                        self.positions.remove((mrv_row, col))  # Remove Queen position
-                        self.used_rows.remove(mrv_row)  # Remove row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.backtracking += 1  # Update backtracking step counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
+        self.replay_slider.max = len(self.trace)
+        with self.replay_slider.hold_trait_notifications():
+            self.replaying = True
+            self.replay_slider.value = len(self.trace)
+        self.replaying = False
+        self.replay_slider.disabled = False
+        self.replay_button.disabled = False
 
-            else:
-                return False
+        self.conflict_index = Conflict_Index(self.positions)
 
-        return False
-
-    ### MRV + AC
+        if self.ai and len(self.positions) == self.n and self.count_conflicts() == 0:
 
-    async def solve_n_queens_util_mrv_ac(self):
-        if self.ai:
-            if len(self.used_rows) == self.n:
-                return True
-
-            mrv_row = self.find_row_with_mrv()
-
-            prune = self.arc_consistency(mrv_row)
-
-            row_threats = self.threats[mrv_row]
-
-            safe_cols = [
-                index for index, threats in enumerate(row_threats) if threats == 0
-            ]
-
-            for col in safe_cols:
-                if col not in prune:  # Check whether a column is pruned off
-
-                    if self.ai:
-                        # Queen Placement
-                        self.board[mrv_row][col] = 1  # Place the queen
-                        self.update_threats(
-                            self.threats, mrv_row, col
-                        )  # Update threats
-                        self.positions.add((mrv_row, col))  # Add Queen position
-                        self.used_rows.add(mrv_row)  # Add row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.queen_placement += 1  # Update Queen placement counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    if await self.solve_n_queens_util_mrv_ac():
-                        return True
-
-                    if self.ai:
-                        # Backtracking
-                        self.board[mrv_row][col] = 0  # Remove the Queen
-                        # Backtrack threats
-                        self.backtrack_threats(self.threats, mrv_row, col)
-                        self.positions.remove((mrv_row, col))  # Remove Queen position
-                        self.used_rows.remove(mrv_row)  # Remove row from used rows
-                        self.step_number += 1  # Update total step counter
-                        self.backtracking += 1  # Update backtracking step counter
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-        return False
-
-    ### MRV + LCV + AC
-
-    async def solve_n_queens_util_mrv_lcv_ac(self):
-        if self.ai:
-            if len(self.used_rows) == self.n:
-                return True
-
-            mrv_row = self.find_row_with_mrv()
-            prune = self.arc_consistency(mrv_row)
-            col_lcv = []
-            for col in range(self.n):
-                if self.is_safe(self.board, mrv_row, col):
-                    lcv = self.count_safe_spots_for_board(mrv_row, col)
-                    col_lcv.append((col, lcv))
-            col_lcv.sort(key=lambda x: x[1])
-
-            for col, _ in col_lcv:
-                if col not in prune:
-                    if self.ai:
-                        self.board[mrv_row][col] = 1
-                        self.update_threats(self.threats, mrv_row, col)
-                        self.positions.add((mrv_row, col))
-                        self.used_rows.add(mrv_row)
-
-                        self.step_number += 1
-                        self.queen_placement += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-
-                    if await self.solve_n_queens_util_mrv_lcv_ac():
-                        return True
-
-                    if self.ai:
-                        self.board[mrv_row][col] = 0
-                        self.backtrack_threats(self.threats, mrv_row, col)
-                        self.positions.remove((mrv_row, col))
-                        self.used_rows.remove(mrv_row)
-
-                        self.step_number += 1
-                        self.backtracking += 1
-
-                        time = self.speed_check()
-                        if time != 0:
-                            self.steps.value = f"Total Steps: {self.step_number}"
-                            self.placements.value = (
-                                f"Total Queen Placements: {self.queen_placement}"
-                            )
-                            self.backtracks.value = (
-                                f"Total Backtracking Steps: {self.backtracking}"
-                            )
-                            self.visualize_board()
-                            self.fig.canvas.draw()
-
-                            await asyncio.sleep(1 / time)
-        return False
-
-    ### Solver Helper Functions ###
-    def forward_checking(self):
-        safe = False  # Boolean flag to return (True: Continue; False: Backtrack)
-        for i in range(self.n):
-            if i not in self.used_rows:
-                safe = False
-                for j in range(self.n):
-                    if self.threats[i][j] == 0:
-                        safe = True
-                        break
-                if not safe:
-                    return False
-        return safe
-
-    def update_threats_matrix(self):
-        self.threats = [[0] * self.n for _ in range(self.n)]
-        for r, c in self.positions:
-            self.update_threats(self.threats, r, c)
-
-    def update_threats(self, threats, row, col):
-        threats[row][col] += 1
-        for i in range(row):
-            threats[i][col] += 1
-        for i in range(row + 1, self.n):
-            threats[i][col] += 1
-        for j in range(col):
-            threats[row][j] += 1
-        for j in range(col + 1, self.n):
-            threats[row][j] += 1
-        for i, j in zip(range(row + 1, self.n), range(col - 1, -1, -1)):
-            threats[i][j] += 1
-        for i, j in zip(range(row + 1, self.n), range(col + 1, self.n)):
-            threats[i][j] += 1
-        for i, j in zip(range(row - 1, -1, -1), range(col - 1, -1, -1)):
-            threats[i][j] += 1
-        for i, j in zip(range(row - 1, -1, -1), range(col + 1, self.n, 1)):
-            threats[i][j] += 1
-
-    def backtrack_threats(self, threats, row, col):
-        threats[row][col] -= 1
-        for i in range(row):
-            threats[i][col] -= 1
-        for i in range(row + 1, self.n):
-            threats[i][col] -= 1
-        for j in range(col):
-            threats[row][j] -= 1
-        for j in range(col + 1, self.n):
-            threats[row][j] -= 1
-        for i, j in zip(range(row + 1, self.n), range(col - 1, -1, -1)):
-            threats[i][j] -= 1
-        for i, j in zip(range(row + 1, self.n), range(col + 1, self.n)):
-            threats[i][j] -= 1
-        for i, j in zip(range(row - 1, -1, -1), range(col - 1, -1, -1)):
-            threats[i][j] -= 1
-        for i, j in zip(range(row - 1, -1, -1), range(col + 1, self.n, 1)):
-            threats[i][j] -= 1
-
-    def find_row_with_mrv(self):
-        mrv = float("inf")
-        mrv_row = None
-        for row in range(self.n):
-            if row not in self.used_rows:
-                row_threats = self.threats[row]
-                safe_cols = [
-                    index for index, threats in enumerate(row_threats) if threats == 0
-                ]
-                safe_spots = len(safe_cols)
-                if safe_spots < mrv:
-                    mrv = safe_spots
-                    mrv_row = row
-        return mrv_row
-
-    def arc_consistency(self, row):
-        prune = []
-        row_threats = self.threats[row]
-        used_rows_copy = self.used_rows.copy()
-        used_rows_copy.add(row)
-        safe_cols = [index for index, threats in enumerate(row_threats) if threats == 0]
-        for j in safe_cols:
-            threats_copy = [r[:] for r in self.threats]
-            self.update_threats(threats_copy, row, j)
-            for i in range(self.n):
-                if i not in used_rows_copy:
-                    if not self.look_ahead(threats_copy, i):
-                        prune.append(j)
-                        break
-        return prune
-
-    def look_ahead(self, threats, row):
-        safe = False
-        for j in range(self.n):
-            if threats[row][j] == 0:
-                safe = True
-                break
-        return safe
-
-    def find_queen_to_remove(self):
-        max_safe = -1
-        row_r = -1
-        col_r = -1
-        for row, col in self.positions:
-            safe_spots = self.count_safe_spots_for_board_remove(row, col)
-            if safe_spots > max_safe:
-                max_safe = safe_spots
-                row_r = row
-                col_r = col
-        return row_r, col_r
-
-    def count_safe_spots_for_board_remove(self, row, col):
-        board_copy = [r[:] for r in self.board]
-        board_copy[row][col] = 0
-        safe_spots = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.is_safe(board_copy, r, c):
-                    safe_spots += 1
-        return safe_spots
-
-    def count_safe_spots_for_board(self, row, col):
-        board_copy = [r[:] for r in self.board]
-        board_copy[row][col] = 1
-        safe_spots = 0
-        for r in range(self.n):
-            for c in range(self.n):
-                if self.is_safe(board_copy, r, c):
-                    safe_spots += 1
-        return safe_spots
-
-    def is_safe(self, board, row, col):
-        for i in range(self.n):
-            if board[i][col] == 1 and i != row:
-                return False
-        for i, j in zip(range(row, -1, -1), range(col, -1, -1)):
-            if board[i][j] == 1:
-                return False
-        for i, j in zip(range(row, self.n, 1), range(col, -1, -1)):
-            if board[i][j] == 1:
-                return False
-        for i, j in zip(range(row, -1, -1), range(col, self.n, 1)):
-            if board[i][j] == 1:
-                return False
-        for i, j in zip(range(row, self.n, 1), range(col, self.n, 1)):
-            if board[i][j] == 1:
-                return False
-        return True
+            self.solution.value = '<span style="color:#769656; font-weight:bold; font-size:15px;">Solution Found!</span>'
+        self.visualize_board()
+        self.redraw()
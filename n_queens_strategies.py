@@ -0,0 +1,331 @@
+"""Pluggable search strategies for the N-Queens CSP solver.
+
+The backtracking core in `n_queens_engine` is the same for every
+configuration; what changes is
+
+- the variable ordering: which unassigned row to fill next,
+- the value ordering: in which order to try that row's columns,
+- the filtering: whether the current node is still consistent and which of
+  the row's columns can be pruned before trying them.
+
+Each strategy is a small class that queries the solver's bitmask board
+state. New heuristics are added by writing a class and registering it in one
+of the tables at the bottom of this module; the UI dropdowns are built from
+the same tables.
+"""
+
+from collections import deque
+
+
+def iter_bits(mask):
+    """Yield the indices of the set bits of `mask` in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def nth_bit(mask, k):
+    """
+    Index of the `k`-th lowest set bit of `mask` (from 0), found by halving
+    the mask: O(log N) big-int operations rather than O(k) bit scans.
+
+        >>> nth_bit(0b101100, 1)
+        3
+    """
+    index = 0
+    width = mask.bit_length()
+    while width > 1:
+        half = width // 2
+        low = mask & ((1 << half) - 1)
+        count = low.bit_count()
+        if k < count:
+            mask, width = low, half
+        else:
+            k -= count
+            mask >>= half
+            index += half
+            width -= half
+    return index
+
+
+### Variable Ordering ###
+class Static_Ordering:
+    """Fill rows top to bottom, skipping rows that already hold a queen."""
+
+    def select(self, solver, row):
+        while solver.rows >> row & 1:
+            row += 1
+        return row
+
+
+class Lowest_Row_Tie_Break:
+    """
+    Among rows tied on MRV, the topmost one.
+
+    Tie-breakers get the tied rows as one of the solver's bucket bitmasks:
+    bit i stands for row `solver.bucket_rows[i]`, and `row_order` lays the
+    rows out most preferred first, so the lowest bit wins.
+    """
+
+    def row_order(self, n):
+        return list(range(n))
+
+    def choose(self, solver, rows):
+        return solver.bucket_rows[(rows & -rows).bit_length() - 1]
+
+
+class Degree_Tie_Break(Lowest_Row_Tie_Break):
+    """
+    Among rows tied on MRV, the most constraining one (degree heuristic).
+    Every unused row constrains all the others, but a queen in a middle row
+    has the longest diagonals on average and so attacks the most squares of
+    the other rows: the row nearest the middle wins, the upper one of two.
+    """
+
+    def row_order(self, n):
+        return sorted(range(n), key=lambda row: (abs(2 * row - (n - 1)), row))
+
+
+class Random_Tie_Break(Lowest_Row_Tie_Break):
+    """Among rows tied on MRV, a random one, drawn from `solver.random`."""
+
+    def choose(self, solver, rows):
+        index = nth_bit(rows, solver.random.randrange(rows.bit_count()))
+        return solver.bucket_rows[index]
+
+
+class MRV_Ordering:
+    """
+    Minimum Remaining Values: the unused row with the fewest safe columns.
+
+    When the solver keeps safe spot counts the rows come straight from its
+    buckets of unused rows by free square count, and `tie_breaker` picks
+    among the rows of the lowest bucket. Otherwise every unused row is
+    counted from the masks and the topmost of the fewest wins.
+    """
+
+    def __init__(self, tie_breaker=None):
+        self.tie_breaker = tie_breaker or Lowest_Row_Tie_Break()
+
+    def row_order(self, n):
+        # The order of the solver's bucket bits
+        return self.tie_breaker.row_order(n)
+
+    def select(self, solver, row):
+        if solver.track_safe_counts:
+            rows = solver.fewest_free_rows()
+            if not rows & (rows - 1):
+                return solver.bucket_rows[rows.bit_length() - 1]
+            return self.tie_breaker.choose(solver, rows)
+
+        mrv = float("inf")
+        mrv_row = None
+        rows = solver.rows
+        for row in range(solver.n):
+            if not rows >> row & 1:
+                safe_spots = solver.free_cols(row).bit_count()
+                if safe_spots < mrv:
+                    mrv = safe_spots
+                    mrv_row = row
+        return mrv_row
+
+
+class MRV_Degree_Ordering(MRV_Ordering):
+    """MRV, breaking ties by degree."""
+
+    uses_safe_counts = True
+
+    def __init__(self):
+        super().__init__(Degree_Tie_Break())
+
+
+class MRV_Random_Ordering(MRV_Ordering):
+    """MRV, breaking ties at random."""
+
+    uses_safe_counts = True
+
+    def __init__(self):
+        super().__init__(Random_Tie_Break())
+
+
+### Value Ordering ###
+class Static_Value_Ordering:
+    """Try columns left to right."""
+
+    def order(self, solver, row, domain):
+        return list(iter_bits(domain))
+
+
+class LCV_Ordering:
+    """
+    Least Constraining Value, scored by the safe spots left on the board.
+
+    The solver keeps safe spot counts per column and diagonal up to date as
+    queens come and go, so the spots a candidate would remove (the safe
+    squares on its column and two diagonals) are three lookups instead of a
+    board rescan.
+    """
+
+    uses_safe_counts = True
+
+    def order(self, solver, row, domain):
+        n = solver.n
+        col_safe, diag_safe, anti_safe = solver.col_safe, solver.diag_safe, solver.anti_safe
+        col_lcv = []
+        for col in iter_bits(domain):
+            # The queen's own square lies on all three lines
+            removed = col_safe[col] + diag_safe[col - row + n - 1] + anti_safe[row + col] - 2
+            col_lcv.append((col, solver.safe_spots - removed))
+
+        # Sort the safe col in ascending order based on number of safe spots
+        col_lcv.sort(key=lambda x: x[1])
+        return [col for col, _ in col_lcv]
+
+
+### Filtering ###
+class No_Filtering:
+    def consistent(self, solver):
+        return True
+
+    def domain(self, solver, row):
+        # Bitmask of the columns worth trying in `row`
+        return solver.free_cols(row)
+
+
+class Forward_Checking(No_Filtering):
+    def consistent(self, solver):
+        # Continue only if every unused row still has a safe spot; a counter
+        # check when the solver keeps safe spot counts
+        if solver.track_safe_counts:
+            return not solver.free_rows[0]
+        for i in range(solver.n):
+            if not solver.rows >> i & 1 and not solver.free_cols(i):
+                return False
+        return True
+
+
+class Arc_Consistency(No_Filtering):
+    def domain(self, solver, row):
+        # Prune every column whose placement would leave some other unused
+        # row without a safe spot. One more queen attacks at most three
+        # squares of a row, so only rows with three or fewer safe spots left
+        # can be wiped out and need checking.
+        n = solver.n
+        critical = []
+        if solver.track_safe_counts:
+            # Read those rows from the solver's free square buckets
+            for free_rows in solver.free_rows[:4]:
+                for i in sorted(solver.bucket_rows[b] for b in iter_bits(free_rows)):
+                    if i != row:
+                        critical.append((i - row, solver.free_cols(i)))
+        else:
+            for i in range(n):
+                if i != row and not solver.rows >> i & 1:
+                    free = solver.free_cols(i)
+                    if free.bit_count() <= 3:
+                        critical.append((i - row, free))
+
+        domain = solver.free_cols(row)
+        prune = 0
+        for j in iter_bits(domain):
+            for d, free in critical:
+                # Squares of row i attacked by a queen at (row, j); bits
+                # past the board edge never match a safe spot
+                attack = 1 << j
+                if j + d >= 0:
+                    attack |= 1 << (j + d)
+                if j - d >= 0:
+                    attack |= 1 << (j - d)
+                if not free & ~attack:
+                    prune |= 1 << j
+                    break
+
+        if prune:
+            solver.prune_values(row, prune)
+        return domain & ~prune
+
+
+class Maintaining_Arc_Consistency(No_Filtering):
+    """
+    MAC: enforce arc consistency (AC-3) between every pair of unused rows at
+    each node. Pruned columns stay pruned for the whole subtree through the
+    solver's trail, so later MRV/LCV decisions see the reduced domains.
+    """
+
+    def consistent(self, solver):
+        n = solver.n
+        unused = [r for r in range(n) if not solver.rows >> r & 1]
+        domains = {r: solver.free_cols(r) for r in unused}
+
+        # Arc (r1, r2): every column left in row r1 needs a compatible column
+        # in row r2. A queen attacks at most three squares of another row, so
+        # only arcs towards rows with three or fewer columns can prune.
+        queue = deque()
+        for r2 in unused:
+            if not domains[r2]:
+                return False
+            if domains[r2].bit_count() <= 3:
+                queue.extend((r1, r2) for r1 in unused if r1 != r2)
+        queued = set(queue)
+
+        while queue:
+            arc = queue.popleft()
+            queued.discard(arc)
+            r1, r2 = arc
+            support = domains[r2]
+            d = r2 - r1
+
+            # Any column of r1 that attacks all of r2's columns attacks its
+            # lowest one, so there are at most three candidates to revise
+            c2 = (support & -support).bit_length() - 1
+            prune = 0
+            for c1 in (c2, c2 - d, c2 + d):
+                if 0 <= c1 < n and domains[r1] >> c1 & 1:
+                    attack = 1 << c1
+                    if c1 + d >= 0:
+                        attack |= 1 << (c1 + d)
+                    if c1 - d >= 0:
+                        attack |= 1 << (c1 - d)
+                    if not support & ~attack:
+                        prune |= 1 << c1
+
+            if prune:
+                solver.prune_values(r1, prune)
+                domains[r1] &= ~prune
+                if not domains[r1]:
+                    return False
+                if domains[r1].bit_count() <= 3:
+                    for rk in unused:
+                        if rk != r1 and rk != r2 and (rk, r1) not in queued:
+                            queue.append((rk, r1))
+                            queued.add((rk, r1))
+        return True
+
+
+VARIABLE_ORDERINGS = {
+    "None": Static_Ordering,
+    "MRV": MRV_Ordering,
+    "MRV + Degree": MRV_Degree_Ordering,
+    "MRV + Random": MRV_Random_Ordering,
+}
+VALUE_ORDERINGS = {"None": Static_Value_Ordering, "LCV": LCV_Ordering}
+
+# Dropdown label -> (variable ordering, value ordering)
+ORDERING_STRATEGIES = {
+    "None": ("None", "None"),
+    "MRV": ("MRV", "None"),
+    "LCV": ("None", "LCV"),
+    "MRV + LCV": ("MRV", "LCV"),
+    "MRV + Degree": ("MRV + Degree", "None"),
+    "MRV + Degree + LCV": ("MRV + Degree", "LCV"),
+    "MRV + Random": ("MRV + Random", "None"),
+    "MRV + Random + LCV": ("MRV + Random", "LCV"),
+}
+
+FILTERING_STRATEGIES = {
+    "None": No_Filtering,
+    "Forward Checking": Forward_Checking,
+    "Arc Consistency": Arc_Consistency,
+    "AC-3 (MAC)": Maintaining_Arc_Consistency,
+}
@@ -0,0 +1,188 @@
+"""Compact binary traces of solver runs, for replaying without re-solving.
+
+A trace is the initial board plus the `SolverEvent`s a solver's `steps()`
+yielded, stored as a flat `array('H')` of (op, row, col) records, 6 bytes
+per event. Saved traces start with a small header:
+
+    magic "NQTR", format version, n, initial queen count (two halves),
+    then the initial queens as (row, col) pairs, then the records
+
+all little-endian uint16, which limits traced boards to N < 65536.
+`Mapped_Trace` memory-maps a saved trace so multi-million-event traces can be
+replayed and scrubbed without reading them into memory.
+
+    >>> from n_queens_engine import create_solver
+    >>> trace = Solver_Trace.record(create_solver(6))
+    >>> len(trace), trace[0]
+    (37, SolverEvent(kind='place', row=0, col=0))
+    >>> sorted(trace.state_at(len(trace))[0]) == trace.final_positions()
+    True
+"""
+
+import mmap
+import sys
+from array import array
+
+from n_queens_engine import PLACE, PRUNE, REMOVE, SOLUTION, SolverEvent
+
+# Record op codes, indexed by code
+OPS = (PLACE, REMOVE, PRUNE, SOLUTION)
+OP_CODES = {kind: code for code, kind in enumerate(OPS)}
+
+MAGIC = (0x514E, 0x5254)  # "NQTR" as little-endian uint16s
+VERSION = 1
+HEADER_SIZE = 6  # uint16s before the initial queens
+
+
+class Solver_Trace:
+    """
+    The events of one solver run over an in-memory `array('H')`.
+
+    Indexing and iteration give back `SolverEvent`s. `state_at(i)` rebuilds
+    the board after the first `i` events from the nearest checkpoint, so
+    scrubbing to any point costs at most CHECKPOINT_EVERY events of replay.
+    """
+
+    # Events between stored board snapshots
+    CHECKPOINT_EVERY = 4096
+
+    def __init__(self, n, initial_positions=(), records=None):
+        if n >= 1 << 16:
+            raise ValueError(f"Traces hold boards up to N = {(1 << 16) - 1}")
+        self.n = n
+        self.initial_positions = sorted(set(initial_positions))
+        self.records = array("H") if records is None else records
+        # (positions, placements, removals) after every CHECKPOINT_EVERY events
+        self.checkpoints = [(frozenset(self.initial_positions), 0, 0)]
+
+    @classmethod
+    def record(cls, solver):
+        """Run `solver` to completion through `steps()` and trace every event."""
+        trace = cls(solver.n, solver.positions)
+        for event in solver.steps():
+            trace.append(event)
+        return trace
+
+    def append(self, event):
+        self.records.extend((OP_CODES[event.kind], event.row or 0, event.col or 0))
+
+    def __len__(self):
+        return len(self.records) // 3
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace index out of range")
+        op, row, col = self.records[3 * index : 3 * index + 3]
+        if OPS[op] == SOLUTION:
+            return SolverEvent(SOLUTION, None, None)
+        return SolverEvent(OPS[op], row, col)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def state_at(self, index):
+        """
+        The queens on the board after the first `index` events, with the
+        number of placements and removals among those events.
+        """
+        index = max(0, min(index, len(self)))
+        # Extend the checkpoints far enough, then replay from the last one
+        while len(self.checkpoints) <= index // self.CHECKPOINT_EVERY:
+            start = (len(self.checkpoints) - 1) * self.CHECKPOINT_EVERY
+            positions, placements, removals = self.replay(
+                start, start + self.CHECKPOINT_EVERY
+            )
+            self.checkpoints.append((frozenset(positions), placements, removals))
+        start = index // self.CHECKPOINT_EVERY * self.CHECKPOINT_EVERY
+        return self.replay(start, index)
+
+    def replay(self, start, stop):
+        # Board state at `stop`, from the checkpoint at `start`
+        positions, placements, removals = self.checkpoints[start // self.CHECKPOINT_EVERY]
+        positions = set(positions)
+        place, remove = OP_CODES[PLACE], OP_CODES[REMOVE]
+        records = self.records
+        for i in range(3 * start, 3 * stop, 3):
+            op = records[i]
+            if op == place:
+                positions.add((records[i + 1], records[i + 2]))
+                placements += 1
+            elif op == remove:
+                positions.discard((records[i + 1], records[i + 2]))
+                removals += 1
+        return positions, placements, removals
+
+    def final_positions(self):
+        return sorted(self.state_at(len(self))[0])
+
+    def save(self, path):
+        header = array("H", MAGIC)
+        count = len(self.initial_positions)
+        header.extend((VERSION, self.n, count & 0xFFFF, count >> 16))
+        for row, col in self.initial_positions:
+            header.extend((row, col))
+        records = self.records
+        if sys.byteorder == "big":
+            header.byteswap()
+            records = array("H", records)
+            records.byteswap()
+        with open(path, "wb") as f:
+            header.tofile(f)
+            records.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved trace into memory."""
+        data = array("H")
+        with open(path, "rb") as f:
+            data.frombytes(f.read())
+        if sys.byteorder == "big":
+            data.byteswap()
+        n, initial_positions, offset = read_header(data)
+        return cls(n, initial_positions, data[offset:])
+
+
+class Mapped_Trace(Solver_Trace):
+    """
+    A saved trace read through a memory map: records are paged in as they
+    are replayed instead of loaded up front. Use as a context manager, or
+    call `close()` when done.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder == "big":
+            raise ValueError("Mapped traces need a little-endian host; use load()")
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map).cast("H")
+        n, initial_positions, offset = read_header(self.view)
+        super().__init__(n, initial_positions, self.view[offset:])
+
+    def close(self):
+        # Views into the map must be released before it can be closed
+        self.records.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(data):
+    # (n, initial queens, offset of the first record) of a saved trace
+    if len(data) < HEADER_SIZE or tuple(data[:2]) != MAGIC:
+        raise ValueError("Not an N-Queens trace")
+    version, n, count_low, count_high = data[2:HEADER_SIZE]
+    if version != VERSION:
+        raise ValueError(f"Unsupported trace version: {version}")
+    count = count_low | count_high << 16
+    offset = HEADER_SIZE + 2 * count
+    initial = data[HEADER_SIZE:offset]
+    return n, list(zip(initial[::2], initial[1::2])), offset